@@ -0,0 +1,200 @@
+import json
+import time
+import functools
+import threading
+import contextvars
+from collections import deque
+from contextlib import contextmanager
+from LatencyStats import LatencyStats
+
+class ActionSpan:
+    def __init__(self, timer, name):
+        """
+        One user action, from the click to the rendered result.
+        Time spent in the work beneath it is added per category ('sql',
+        'image', 'widgets'); work done on worker threads may overlap, so
+        the categories can add up to more than the total.
+        """
+        self.timer = timer
+        self.name = name
+        self.started = time.perf_counter()
+        self.phases = {}
+        self.seconds = None  # Total latency, set when the span finishes
+        self._lock = threading.Lock()
+
+    @property
+    def done(self):
+        return self.seconds is not None
+
+    def add(self, category, seconds):
+        """Charge seconds of work to category (ignored once the span is done)"""
+        with self._lock:
+            if not self.done:
+                self.phases[category] = self.phases.get(category, 0.0) + seconds
+
+    def finish(self, widget=None):
+        """
+        End the span and record it. With a widget the span ends once Tk is
+        idle again, i.e. after the widgets just built have been drawn.
+        """
+        if widget is not None:
+            widget.after_idle(self.finish)
+            return
+        with self._lock:
+            if self.done:
+                return
+            self.seconds = time.perf_counter() - self.started
+        self.timer.record(self)
+
+    def cancel(self):
+        """Drop the span without recording it (e.g. a search replaced by a newer one)"""
+        with self._lock:
+            if not self.done:
+                self.seconds = 0.0
+
+
+class ActionTimer:
+    _instance = None  # To hold the single instance of the class
+    _lock = threading.Lock()
+    _current = contextvars.ContextVar('current_action_span', default=None)
+
+    HISTORY_SIZE = 500  # Latest spans kept per action for the rolling histograms
+    BUCKETS_MS = (10, 25, 50, 100, 250, 500, 1000, 2500, 5000)  # Histogram upper bounds
+    EXPORT_PATH = 'action_latency.json'
+
+    def __new__(cls):
+        """Singleton pattern so the GUI and the models below it share one timer"""
+        with cls._lock:
+            if cls._instance is None:
+                cls._instance = super(ActionTimer, cls).__new__(cls)
+                cls._instance._initialize_timer()
+        return cls._instance
+
+    def _initialize_timer(self):
+        """Set up the per-action history of finished spans"""
+        self._history = {}  # action name -> deque of (seconds, phases)
+        self._history_lock = threading.Lock()
+
+    @classmethod
+    def current(cls):
+        """Return the span of the action being handled, or None"""
+        return cls._current.get()
+
+    def start(self, name):
+        """
+        Start timing the action name and return its span, without making it
+        current: pass it to phase() explicitly and finish or cancel it.
+        """
+        return ActionSpan(self, name)
+
+    @contextmanager
+    def action(self, name, widget=None, finish=True):
+        """
+        Time the action name while the block runs and return its span.
+        The span is current inside the block, so model calls, image loads
+        and tasks spawned there are charged to it. With finish=False the
+        block only starts the action and the caller finishes the span once
+        its asynchronous work has rendered; otherwise it ends with the
+        block (after the next redraw when a widget is given).
+        """
+        span = self.start(name)
+        token = self._current.set(span)
+        try:
+            yield span
+        except BaseException:
+            span.cancel()
+            raise
+        finally:
+            self._current.reset(token)
+        if finish:
+            span.finish(widget)
+
+    @classmethod
+    def timed(cls, name, finish=True):
+        """
+        Decorator timing every call of a handler as the action name (see
+        action). The handler can reach its span through ActionTimer.current().
+        """
+        def decorator(handler):
+            @functools.wraps(handler)
+            def wrapper(*args, **kwargs):
+                with cls().action(name, finish=finish):
+                    return handler(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    @contextmanager
+    def phase(self, category, span=None):
+        """Charge the time the block takes to category of span (default: the current span)"""
+        span = span or self.current()
+        if span is None:
+            yield
+            return
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            span.add(category, time.perf_counter() - started)
+
+    def record(self, span):
+        """Add a finished span to its action's history"""
+        with self._history_lock:
+            history = self._history.get(span.name)
+            if history is None:
+                history = self._history[span.name] = deque(maxlen=self.HISTORY_SIZE)
+            history.append((span.seconds, dict(span.phases)))
+
+    def summary(self):
+        """
+        Return, per action, the latency percentiles and histogram of its
+        latest spans and the mean time charged to each category (plus
+        'other' for the rest: Python, Tk and waiting).
+        """
+        with self._history_lock:
+            histories = {name: list(history) for name, history in self._history.items()}
+
+        summary = {}
+        for name, spans in histories.items():
+            latencies = sorted(seconds * 1000 for seconds, _ in spans)
+            histogram = {f"<={bound}": 0 for bound in self.BUCKETS_MS}
+            histogram[f">{self.BUCKETS_MS[-1]}"] = 0
+            for latency in latencies:
+                bound = next((bound for bound in self.BUCKETS_MS if latency <= bound), None)
+                histogram[f"<={bound}" if bound is not None else f">{self.BUCKETS_MS[-1]}"] += 1
+
+            phases = {}
+            for _, span_phases in spans:
+                for category, seconds in span_phases.items():
+                    phases[category] = phases.get(category, 0.0) + seconds * 1000
+            breakdown = {category: total / len(spans) for category, total in phases.items()}
+            mean = sum(latencies) / len(latencies)
+            breakdown['other'] = max(0.0, mean - sum(breakdown.values()))
+
+            summary[name] = {
+                'count': len(latencies),
+                'mean_ms': mean,
+                'p50_ms': LatencyStats.percentile(latencies, 0.50),
+                'p95_ms': LatencyStats.percentile(latencies, 0.95),
+                'p99_ms': LatencyStats.percentile(latencies, 0.99),
+                'max_ms': latencies[-1],
+                'histogram_ms': histogram,
+                'mean_breakdown_ms': breakdown,
+            }
+        return summary
+
+    def export(self, path=EXPORT_PATH):
+        """Write the summary to path as JSON; nothing is written before the first action"""
+        summary = self.summary()
+        if not summary:
+            return
+        try:
+            with open(path, 'w') as f:
+                json.dump({'exported_at': time.strftime('%Y-%m-%dT%H:%M:%S'),
+                           'actions': summary}, f, indent=2)
+        except OSError as e:
+            print(f"Error exporting action latencies: {e}")
+
+    def reset(self):
+        """Forget every recorded span"""
+        with self._history_lock:
+            self._history.clear()
@@ -2,8 +2,16 @@ from User import User
 from Order import Order
 from Book import Book
 from DatabaseManager import DatabaseManager
+from CatalogCache import CatalogCache
 class Admin (User):
 
+    # Status an order must currently have to move to each target status
+    ORDER_TRANSITIONS = {
+        "confirmed": "pending",
+        "shipped": "confirmed",
+        "cancelled": "pending"
+    }
+
     # Attributes for the Admin class
     def __init__(self, username, password):
         super().__init__(username, password)
@@ -22,6 +30,7 @@ class Admin (User):
         WHERE ISBN=?
         """
         db_manager.execute_query(query, (title, author, price, stock, edition, category, ISBN))
+        CatalogCache().invalidate(ISBN)
 
     def delete_book(self, ISBN):
         """Delete a book from the database by its ISBN."""
@@ -30,6 +39,7 @@ class Admin (User):
         query = "DELETE FROM books WHERE ISBN = ?"
             # Execute the query
         db_manager.execute_query(query, (ISBN,))
+        CatalogCache().invalidate(ISBN)
         
         # Check if the book was deleted
         
@@ -45,17 +55,18 @@ class Admin (User):
         
         # Method to view customer orders
         """Retrieve and display all orders from the database."""
-        query = "SELECT * FROM orders"
-        self.cursor.execute(query)
-        orders = self.cursor.fetchall()
+        query = "SELECT order_id, customer_username, created_at, status FROM orders ORDER BY order_id"
+        db_manager = DatabaseManager()
 
-        # Print orders in a readable format
+        # Print orders in a readable format, streaming them from the database
         print("Order ID | Customer ID | Order Date              | Status")
         print("-" * 50)
-        for order in orders:
-            print(f"{order[0]:<8} | {order[1]:<11} | {order[2]} | {order[3]}")
+        count = 0
+        for order in db_manager.iter_entries(query):
+            print(f"{order.order_id:<8} | {order.customer_username:<11} | {order.created_at} | {order.status}")
+            count += 1
         
-        return orders
+        return count
 
     def confirm_order(self, order_id):
         """
@@ -65,45 +76,7 @@ class Admin (User):
         Raises:
             Exception: If order isn't in pending status
         """
-        db_manager = DatabaseManager()
-        
-        # Check order status first
-        query = "SELECT status FROM orders WHERE order_id = ?"
-        order_status = db_manager.fetch_one_entry(query, (order_id,))
-        
-        if not order_status:
-            raise Exception("Order not found")
-        
-        if order_status[0].lower() != 'pending':
-            raise Exception("Only pending orders can be confirmed")
-        
-        # Update order status to confirmed
-        self.update_status("confirmed", order_id)
-        
-        # Get all books in this order with their quantities
-        query = """
-        SELECT book_isbn, quantity 
-        FROM order_books 
-        WHERE order_id = ?
-        """
-        order_books = db_manager.fetch_all_entries(query, (order_id,))
-        
-        # Update sold count and stock for each book
-        for book_isbn, quantity in order_books:
-            # Get current sold count and stock
-            get_book_query = "SELECT sold, stock FROM books WHERE ISBN = ?"
-            book_data = db_manager.fetch_one_entry(get_book_query, (book_isbn,))
-            
-            if book_data:
-                current_sold = book_data[0] or 0  # Use 0 if sold is NULL
-                current_stock = book_data[1]
-                
-                new_sold = current_sold + quantity
-                new_stock = current_stock - quantity
-                
-                # Update both sold count and stock
-                update_query = "UPDATE books SET sold = ?, stock = ? WHERE ISBN = ?"
-                db_manager.execute_query(update_query, (new_sold, new_stock, book_isbn))
+        self._transition_order(order_id, "confirmed")
 
     def cancel_order(self, order_id):
         """
@@ -113,24 +86,80 @@ class Admin (User):
         Raises:
             Exception: If order isn't in pending status
         """
-        db_manager = DatabaseManager()
-        
-        # Check order status
-        query = "SELECT status FROM orders WHERE order_id = ?"
-        order_status = db_manager.fetch_one_entry(query, (order_id,))
-        
-        if not order_status:
-            raise Exception("Order not found")
-        
-        if order_status[0].lower() != 'pending':
-            raise Exception("Only pending orders can be cancelled")
-        
-        # Update order status to cancelled
-        self.update_status("cancelled", order_id)
+        self._transition_order(order_id, "cancelled")
+
+    def bulk_transition(self, order_ids, target_status):
+        """
+        Move a batch of orders to target_status in a single transaction.
+        Confirming turns the stock reserved at checkout into sold books (an
+        order whose hold expired fails if its stock is gone meanwhile);
+        cancelling gives the reserved stock back. Orders are checked under
+        the write lock, so concurrent transitions cannot both apply.
+        Args:
+            order_ids: The IDs of the orders to transition
+            target_status: 'confirmed', 'shipped' or 'cancelled'
+        Returns:
+            A dictionary with the 'succeeded' order IDs and the 'failed'
+            orders mapped to the reason they could not be transitioned
+        """
+        target_status = target_status.lower()
+        if target_status not in self.ORDER_TRANSITIONS:
+            raise ValueError(f"Unknown order status: {target_status}")
+        required_status = self.ORDER_TRANSITIONS[target_status]
 
+        db_manager = DatabaseManager()
+        # Stock held past its reservation goes back on sale first
+        db_manager.release_expired_reservations()
+
+        with db_manager.transaction():
+            orders = db_manager.fetch_entries_by_keys("orders", "order_id", order_ids, "order_id, status")
+
+            succeeded = []
+            failed = {}
+            for order_id in dict.fromkeys(order_ids):
+                order = orders.get(order_id)
+                if not order:
+                    failed[order_id] = "Order not found"
+                elif order.status.lower() != required_status:
+                    failed[order_id] = f"Only {required_status} orders can be {target_status}"
+                else:
+                    succeeded.append(order_id)
+
+            if target_status == "confirmed" and succeeded:
+                failed.update(db_manager.convert_reservations(succeeded))
+                succeeded = [order_id for order_id in succeeded if order_id not in failed]
+
+            statements = []
+            for start in range(0, len(succeeded), db_manager.MAX_QUERY_PARAMS):
+                chunk = succeeded[start:start + db_manager.MAX_QUERY_PARAMS]
+                placeholders = ", ".join("?" * len(chunk))
+                statements.append((
+                    f"UPDATE orders SET status = ? WHERE order_id IN ({placeholders})",
+                    (target_status, *chunk)
+                ))
+
+            if statements:
+                db_manager.execute_transaction(statements)
+                if target_status == "cancelled":
+                    db_manager.release_reservations(succeeded)
+                self.status = target_status
+
+        return {'succeeded': succeeded, 'failed': failed}
+
+    def _transition_order(self, order_id, target_status):
+        """Transition a single order, raising if it cannot be transitioned"""
+        result = self.bulk_transition([order_id], target_status)
+        if result['failed']:
+            raise Exception(result['failed'][order_id])
+
+    def top_selling_books(self, period=None):
+        """
+        Generate sales statistics for top-selling books from confirmed orders.
+        period: None for all time, or 'day', 'week' or 'month' for the current one
+        """
+        if period:
+            return DatabaseManager().top_selling_books_in_period(period)
 
-    def top_selling_books(self):
-        """Generate sales statistics for top-selling books from confirmed orders."""
         query = """
         SELECT ISBN, title, author, sold
         FROM books
@@ -142,29 +171,31 @@ class Admin (User):
         top_books = db_manager.fetch_all_entries(query)
         return top_books
     
-    def top_categories(self):
-        """Retrieve the top 3 sold categories from confirmed orders."""
-        query = """
-        SELECT category, SUM(sold) AS total_sold
-        FROM books
-        GROUP BY category
-        ORDER BY total_sold DESC
-        LIMIT 3;
+    def top_categories(self, period=None):
+        """
+        Retrieve the top 3 sold categories from confirmed orders.
+        period: None for all time, or 'day', 'week' or 'month' for the current one
         """
         db_manager = DatabaseManager()
+        if period:
+            return db_manager.top_categories_in_period(period)
+        query = db_manager.TOP_CATEGORIES_QUERY
         results = db_manager.fetch_all_entries(query)
         return results
         
     def stock_level(self):
         """Retrieve and display each book with its available stock quantity."""
+        return list(self.iter_stock_levels())
+
+    def iter_stock_levels(self, batch_size=DatabaseManager.ITER_BATCH_SIZE):
+        """Stream each book with its available stock quantity, most stocked first."""
         query = """
         SELECT ISBN, title, stock
         FROM books
         ORDER BY stock DESC;
         """
         db_manager = DatabaseManager()
-        books = db_manager.fetch_all_entries(query)
-        return books
+        return db_manager.iter_entries(query, batch_size=batch_size)
 
 
     def generate_statistics(self):
@@ -183,27 +214,14 @@ class Admin (User):
     def clone_book(self, isbn):
         """Clone a book from an existing one in the database."""
         db_manager = DatabaseManager()
-        query = """
-        SELECT title, author, price, category, stock, edition, cover_image_path, sold, reviews
-        FROM books WHERE ISBN = ?
-        """
-        book_data = db_manager.fetch_one_entry(query, (isbn,))
+        book_data = db_manager.get_book(isbn)
         
         if not book_data:
             raise ValueError("Book not found")
         
-        # Create a Book instance with the fetched data
-        original_book = Book(
-            title=book_data[0],
-            author=book_data[1],
-            price=book_data[2],
-            category=book_data[3],
-            stock=book_data[4],
-            edition=book_data[5],
-            cover_image=book_data[6],
-            sold=book_data[7],
-            reviews=book_data[8]
-        )
+        # Create a Book instance with the fetched data and its reviews
+        reviews = db_manager.fetch_all_entries("SELECT review FROM book_reviews WHERE ISBN = ?", (isbn,))
+        original_book = Book.from_row(book_data, reviews=[row.review for row in reviews or []])
         
         # Return the cloned book
         return original_book.clone()
@@ -216,18 +234,4 @@ class Admin (User):
         Raises:
             Exception: If order isn't in confirmed status
         """
-        db_manager = DatabaseManager()
-        
-        # Check order status
-        query = "SELECT status FROM orders WHERE order_id = ?"
-        order_status = db_manager.fetch_one_entry(query, (order_id,))
-        
-        if not order_status:
-            raise Exception("Order not found")
-        
-        if order_status[0].lower() != 'confirmed':
-            raise Exception("Only confirmed orders can be shipped")
-        
-        # Update order status to shipped
-        self.update_status("shipped", order_id)
-    
+        self._transition_order(order_id, "shipped")
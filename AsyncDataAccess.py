@@ -0,0 +1,80 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from ActionTimer import ActionTimer
+from DatabaseManager import DatabaseManager
+
+class AsyncDataAccess:
+    MAX_WORKERS = 4  # Database calls allowed to run at the same time
+
+    def __init__(self, max_workers=MAX_WORKERS):
+        """
+        Coroutine versions of the DatabaseManager, Customer and Admin calls.
+        Every call runs on a bounded pool of worker threads, each with its
+        own database connections, so awaiting it leaves the event loop (and
+        the Tk window it is driven from) free to handle other events.
+        """
+        self.db_manager = DatabaseManager()
+        self.action_timer = ActionTimer()
+        self._executor = ThreadPoolExecutor(max_workers=max_workers,
+                                            thread_name_prefix='db-worker')
+
+    async def run(self, func, *args, **kwargs):
+        """
+        Run func(*args, **kwargs) on a worker thread and return its result.
+        Its time on the worker is charged as 'sql' to the current action.
+        """
+        loop = asyncio.get_running_loop()
+        span = ActionTimer.current()
+
+        def call():
+            with self.action_timer.phase('sql', span):
+                return func(*args, **kwargs)
+
+        return await loop.run_in_executor(self._executor, call)
+
+    # DatabaseManager
+    async def fetch_one_entry(self, query, params=None):
+        return await self.run(self.db_manager.fetch_one_entry, query, params)
+
+    async def fetch_all_entries(self, query, params=None):
+        return await self.run(self.db_manager.fetch_all_entries, query, params)
+
+    async def execute_query(self, query, params=None):
+        return await self.run(self.db_manager.execute_query, query, params)
+
+    async def execute_transaction(self, statements):
+        return await self.run(self.db_manager.execute_transaction, statements)
+
+    async def fetch_page(self, table, columns, key_column, **kwargs):
+        return await self.run(self.db_manager.fetch_page, table, columns, key_column, **kwargs)
+
+    async def search_books(self, search_term="", category=None, limit=50, after=None):
+        return await self.run(self.db_manager.search_books, search_term, category,
+                              limit=limit, after=after)
+
+    # Customer
+    async def place_order(self, customer, shipping_type, gift_note=None, customization=None):
+        return await self.run(customer.place_order, shipping_type, gift_note, customization)
+
+    async def cancel_customer_order(self, customer, order_id):
+        return await self.run(customer.cancel_order, order_id)
+
+    async def update_profile(self, customer, **changes):
+        return await self.run(customer.update_profile, **changes)
+
+    # Admin
+    async def bulk_transition(self, admin, order_ids, target_status):
+        return await self.run(admin.bulk_transition, order_ids, target_status)
+
+    async def top_selling_books(self, admin, period=None):
+        return await self.run(admin.top_selling_books, period)
+
+    async def top_categories(self, admin, period=None):
+        return await self.run(admin.top_categories, period)
+
+    async def stock_level(self, admin):
+        return await self.run(admin.stock_level)
+
+    def shutdown(self):
+        """Stop the worker threads, dropping calls that have not started"""
+        self._executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,246 @@
+import os
+import json
+import time
+import random
+import shutil
+import sqlite3
+import argparse
+import platform
+import tempfile
+from Book import Book
+from LatencyStats import LatencyStats
+from DatabaseManager import DatabaseManager
+
+class Benchmark:
+    WORDS = ('shadow', 'river', 'garden', 'empire', 'silent', 'winter', 'secret', 'golden',
+             'journey', 'ocean', 'forest', 'machine', 'history', 'kingdom', 'night', 'light',
+             'city', 'storm', 'memory', 'stone', 'fire', 'glass', 'mountain', 'letter')
+    CATEGORIES = ('Fiction', 'Adventure', 'Self Help', 'History', 'Science', 'Romance',
+                  'Mystery', 'Biography', 'Fantasy', 'Poetry')
+    STATUSES = ('pending', 'confirmed', 'shipped', 'Cancelled')
+    CHUNK_SIZE = 5000  # Rows generated per transaction
+    HISTORY_DAYS = 90  # Generated orders are spread over this many past days
+    # Start of the day/week/month an order was placed in, like
+    # DatabaseManager.PERIOD_STARTS but for o.created_at instead of now
+    HISTORY_PERIOD_STARTS = {period: start.replace("'now'", "o.created_at")
+                             for period, start in DatabaseManager.PERIOD_STARTS.items()}
+
+    def __init__(self, db_path, books=10000, users=200, orders=5000, seed=42):
+        """
+        Time the core bookstore operations against a synthetic database.
+        db_path must be a throwaway file: the DatabaseManager singleton is
+        pointed at it, so the Benchmark must be created before anything else
+        opens the database (otherwise it would write into that database).
+        books/users/orders set the scale of the generated data.
+        """
+        if DatabaseManager._instance is not None:
+            raise RuntimeError("DatabaseManager is already open; create the Benchmark before anything "
+                               "else uses the database so the synthetic data goes to db_path")
+        self.scale = {'books': books, 'users': users, 'orders': orders}
+        self.random = random.Random(seed)
+        DatabaseManager.DB_PATH = db_path
+        self.db_manager = DatabaseManager()
+        self.results = {}
+
+    # Synthetic data
+    def _isbn(self, index):
+        return f"978{index:010d}"
+
+    def _title(self):
+        return " ".join(self.random.choice(self.WORDS).capitalize() for _ in range(self.random.randint(2, 4)))
+
+    def generate(self):
+        """Fill the database with the synthetic catalog, users and order history"""
+        books = []
+        for index in range(self.scale['books']):
+            books.append(Book(self._isbn(index), self._title(), f"Author {index % 997}",
+                              round(self.random.uniform(5, 60), 2), 0, 1_000_000, None, '1',
+                              self.random.choice(self.CATEGORIES)))
+            if len(books) >= self.CHUNK_SIZE:
+                self.db_manager.upsert_books(books)
+                books = []
+        if books:
+            self.db_manager.upsert_books(books)
+
+        self.db_manager.execute_transaction([(
+            "INSERT OR IGNORE INTO users (username, password, role) VALUES (?, 'x', 'customer')",
+            (f"customer{index}",)
+        ) for index in range(self.scale['users'])])
+
+        # Order history is written directly; sold counts and the sales
+        # rollups follow the history
+        for start in range(0, self.scale['orders'], self.CHUNK_SIZE):
+            orders = []
+            lines = {}
+            for _ in range(min(self.CHUNK_SIZE, self.scale['orders'] - start)):
+                status = self.random.choice(self.STATUSES)
+                order_lines = {self._isbn(self.random.randrange(self.scale['books'])): self.random.randint(1, 3)
+                               for _ in range(self.random.randint(1, 4))}
+                age = f"-{self.random.randrange(self.HISTORY_DAYS * 86400)} seconds"
+                orders.append((f"customer{self.random.randrange(self.scale['users'])}", status, age, order_lines))
+            with self.db_manager.transaction():
+                cursor = self.db_manager.conn.cursor()
+                for username, status, age, order_lines in orders:
+                    cursor.execute("""
+                    INSERT INTO orders (customer_username, status, total, shipping_method, created_at)
+                    VALUES (?, ?, 0, 'standard', strftime('%Y-%m-%d %H:%M:%S', 'now', ?))
+                    """, (username, status, age))
+                    order_id = cursor.lastrowid
+                    cursor.executemany("INSERT INTO order_books (order_id, book_isbn, quantity) VALUES (?, ?, ?)",
+                                       [(order_id, isbn, quantity) for isbn, quantity in order_lines.items()])
+                    if status in ('confirmed', 'shipped'):
+                        for isbn, quantity in order_lines.items():
+                            lines[isbn] = lines.get(isbn, 0) + quantity
+                cursor.executemany("UPDATE books SET sold = sold + ? WHERE ISBN = ?",
+                                   [(quantity, isbn) for isbn, quantity in lines.items()])
+        self._fill_rollups()
+        self.db_manager.execute_query("ANALYZE")
+
+    def _fill_rollups(self):
+        """
+        Rebuild the sales rollups from the generated history. The rollup
+        trigger only fires when an order is confirmed, which the history
+        never goes through; each order counts in the periods it was placed in.
+        """
+        statements = [("DELETE FROM sales_rollups", None), ("DELETE FROM category_sales_rollups", None)]
+        for period, start in self.HISTORY_PERIOD_STARTS.items():
+            statements.append((f"""
+            INSERT INTO sales_rollups (period, period_start, ISBN, quantity)
+            SELECT '{period}', {start}, ob.book_isbn, SUM(ob.quantity)
+            FROM orders o
+            JOIN order_books ob ON ob.order_id = o.order_id
+            WHERE LOWER(o.status) IN ('confirmed', 'shipped')
+            GROUP BY 2, 3
+            """, None))
+            statements.append((f"""
+            INSERT INTO category_sales_rollups (period, period_start, category, quantity)
+            SELECT '{period}', {start}, IFNULL(b.category, ''), SUM(ob.quantity)
+            FROM orders o
+            JOIN order_books ob ON ob.order_id = o.order_id
+            JOIN books b ON b.ISBN = ob.book_isbn
+            WHERE LOWER(o.status) IN ('confirmed', 'shipped')
+            GROUP BY 2, 3
+            """, None))
+        self.db_manager.execute_transaction(statements)
+
+    # Timing
+    def measure(self, name, operation, iterations, warmup=5):
+        """Run operation(i) warmup + iterations times and record its latency distribution"""
+        for i in range(warmup):
+            operation(i)
+        timings = []
+        started = time.perf_counter()
+        for i in range(iterations):
+            before = time.perf_counter()
+            operation(i)
+            timings.append(time.perf_counter() - before)
+        elapsed = time.perf_counter() - started
+
+        timings.sort()
+        self.results[name] = {
+            'iterations': iterations,
+            'mean_ms': sum(timings) / len(timings) * 1000,
+            'p50_ms': LatencyStats.percentile(timings, 0.50) * 1000,
+            'p95_ms': LatencyStats.percentile(timings, 0.95) * 1000,
+            'p99_ms': LatencyStats.percentile(timings, 0.99) * 1000,
+            'max_ms': timings[-1] * 1000,
+            'ops_per_sec': iterations / elapsed if elapsed else 0.0,
+        }
+        return self.results[name]
+
+    def run(self, iterations=200):
+        """Time every benchmarked operation and return the results"""
+        from Admin import Admin
+        from Customer import Customer
+
+        db_manager = self.db_manager
+        admin = Admin('benchmark_admin', 'x')
+        customer = Customer('customer0', 'x', None, None)
+        books = self.scale['books']
+        pick = self.random.choice
+
+        self.measure('search_books', lambda i: db_manager.search_books(pick(self.WORDS), limit=40), iterations)
+        self.measure('search_books_category',
+                     lambda i: db_manager.search_books(pick(self.WORDS), pick(self.CATEGORIES), limit=40),
+                     iterations)
+        self.measure('search_books_browse', lambda i: db_manager.search_books("", limit=40), iterations)
+
+        def next_search_page(i):
+            term = pick(self.WORDS)
+            first_page = db_manager.search_books(term, limit=40)
+            if first_page:
+                db_manager.search_books(term, limit=40, after=first_page[-1])
+        self.measure('search_books_two_pages', next_search_page, iterations)
+
+        self.measure('get_book', lambda i: db_manager.get_book(self._isbn(self.random.randrange(books))),
+                     iterations)
+
+        placed = []
+
+        def place_order(i):
+            customer.cart = {self._isbn(self.random.randrange(books)): self.random.randint(1, 3)
+                             for _ in range(self.random.randint(1, 5))}
+            placed.append(customer.place_order('standard')['order_id'])
+        self.measure('place_order', place_order, iterations)
+
+        self.measure('confirm_order', lambda i: admin.confirm_order(placed.pop()), min(iterations, len(placed)),
+                     warmup=0)
+        self.measure('top_selling_books', lambda i: admin.top_selling_books(), iterations)
+        self.measure('top_selling_books_week', lambda i: admin.top_selling_books('week'), iterations)
+        self.measure('top_selling_books_month', lambda i: admin.top_selling_books('month'), iterations)
+        self.measure('top_categories', lambda i: admin.top_categories(), iterations)
+        self.measure('top_categories_week', lambda i: admin.top_categories('week'), iterations)
+        self.measure('orders_page', lambda i: db_manager.fetch_page(
+            'orders', ('order_id', 'customer_username', 'status', 'total'), 'order_id', descending=True),
+            iterations)
+        return self.results
+
+    def report(self):
+        """Return the results with the scale and environment they were measured in"""
+        return {
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'scale': self.scale,
+            'environment': {
+                'python': platform.python_version(),
+                'sqlite': sqlite3.sqlite_version,
+                'platform': platform.platform(),
+            },
+            'operations': self.results,
+        }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the core bookstore operations")
+    parser.add_argument('--books', type=int, default=10000)
+    parser.add_argument('--users', type=int, default=200)
+    parser.add_argument('--orders', type=int, default=5000)
+    parser.add_argument('--iterations', type=int, default=200)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--output', default='benchmark_results.json')
+    parser.add_argument('--keep-db', action='store_true', help="Keep the generated database")
+    args = parser.parse_args()
+
+    work_dir = tempfile.mkdtemp(prefix='bookstore_benchmark_')
+    benchmark = Benchmark(os.path.join(work_dir, 'benchmark.db'), args.books, args.users,
+                          args.orders, args.seed)
+    try:
+        started = time.perf_counter()
+        benchmark.generate()
+        print(f"Generated {args.books} books, {args.users} users and {args.orders} orders "
+              f"in {time.perf_counter() - started:.1f}s")
+
+        benchmark.run(args.iterations)
+        print(f"{'Operation':<24} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'ops/s':>10}")
+        for name, result in benchmark.results.items():
+            print(f"{name:<24} {result['p50_ms']:>9.2f} {result['p95_ms']:>9.2f} "
+                  f"{result['p99_ms']:>9.2f} {result['ops_per_sec']:>10.1f}")
+
+        with open(args.output, 'w') as f:
+            json.dump(benchmark.report(), f, indent=2)
+        print(f"Results saved to {args.output}")
+    finally:
+        benchmark.db_manager.close()
+        if args.keep_db:
+            print(f"Database kept in {work_dir}")
+        else:
+            shutil.rmtree(work_dir, ignore_errors=True)
@@ -2,6 +2,11 @@ import copy
 from BookPrototype import BookPrototype
 
 class Book (BookPrototype):
+    # Fixed attribute slots instead of a per-instance __dict__, so a large
+    # catalog of Book objects takes far less memory
+    __slots__ = ('__ISBN', '__title', '__author', '__price', '__popularity', '__category',
+                 '__stock', '__edition', '__cover_image', '__sold', '__reviews')
+
     def __init__(self, ISBN, title, author, price, popularity, stock, cover_image, edition, category, sold=0, reviews=None):
         """
         Initialize book attributes with private variables.
@@ -18,6 +23,18 @@ class Book (BookPrototype):
         self.__sold= sold
         self.__reviews= reviews
 
+    @classmethod
+    def from_row(cls, row, reviews=None):
+        """
+        Create a Book from a books table row record (see RowRecord).
+        Columns missing from the row get the table's defaults.
+        """
+        return cls(row.ISBN, row.title, row.author, row.price,
+                   getattr(row, 'popularity', None), row.stock,
+                   getattr(row, 'cover_image_path', None), getattr(row, 'edition', None),
+                   getattr(row, 'category', 'Undefined'), getattr(row, 'sold', 0),
+                   reviews)
+
     # Getter and Setter for ISBN
     def getisbn(self):
         return self.__ISBN
@@ -119,21 +136,12 @@ class Book (BookPrototype):
     def clone(self):
         """
         Implement the clone method to create a copy of the current book.
-        Uses the copy module to perform a deep copy.
+        Copies every slot at once with the copy module; the reviews list is
+        copied too so the clone can be changed on its own.
         :return: A new Book instance with copied data
         """
-        new_book = Book(
-            self.__ISBN,
-            self.__title,
-            self.__author,
-            self.__price,
-            self.__popularity,
-            self.__stock,
-            self.__cover_image,
-            self.__edition,
-            self.__category,
-            self.__sold,
-            self.__reviews
-        )
+        new_book = copy.copy(self)
+        if self.__reviews is not None:
+            new_book.__reviews = list(self.__reviews)
         return new_book
 
@@ -3,6 +3,7 @@ import copy
 
 # Step 1: Define the Prototype Interface
 class BookPrototype(ABC):
+    __slots__ = ()  # Lets subclasses drop the per-instance __dict__
     @abstractmethod
     def clone(self):
         """
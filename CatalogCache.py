@@ -0,0 +1,92 @@
+import time
+import threading
+from collections import OrderedDict
+
+class CatalogCache:
+    _instance = None  # To hold the single instance of the class
+    _lock = threading.Lock()
+
+    MAX_ENTRIES = 2000  # Books kept in memory before the least recently used is evicted
+    VALIDATE_INTERVAL_S = 1.0  # How often the books table version is checked for outside writes
+
+    def __new__(cls):
+        """Singleton pattern so the whole process shares one catalog cache"""
+        with cls._lock:
+            if cls._instance is None:
+                cls._instance = super(CatalogCache, cls).__new__(cls)
+                cls._instance._initialize_cache()
+        return cls._instance
+
+    def _initialize_cache(self):
+        """Set up the LRU of book rows and its counters"""
+        self._books = OrderedDict()  # ISBN -> books row
+        self._books_lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.generation = 0  # Bumped by every invalidation
+        self._version = None  # books table version the cached rows belong to
+        self._validated_at = 0.0
+
+    def get(self, isbn):
+        """Return the cached row for isbn, or None, and count the hit or miss"""
+        with self._books_lock:
+            row = self._books.get(isbn)
+            if row is None:
+                self.misses += 1
+                return None
+            self._books.move_to_end(isbn)
+            self.hits += 1
+            return row
+
+    def put_many(self, rows, generation):
+        """
+        Cache books rows (ISBN first) read while the cache was at generation.
+        Rows read before an invalidation that happened meanwhile are dropped,
+        since they may predate the write that caused it.
+        """
+        with self._books_lock:
+            if generation != self.generation:
+                return
+            for row in rows:
+                self._books[row[0]] = row
+                self._books.move_to_end(row[0])
+            while len(self._books) > self.MAX_ENTRIES:
+                self._books.popitem(last=False)
+
+    def invalidate(self, *isbns):
+        """Forget the given books after they were changed or deleted"""
+        with self._books_lock:
+            self.generation += 1
+            for isbn in isbns:
+                self._books.pop(str(isbn), None)
+
+    def invalidate_all(self):
+        """Forget every book (e.g. after a category rename touching many)"""
+        with self._books_lock:
+            self.generation += 1
+            self._books.clear()
+
+    def needs_validation(self):
+        """Return True when the books table version is due to be checked again"""
+        return time.monotonic() - self._validated_at >= self.VALIDATE_INTERVAL_S
+
+    def validate(self, version):
+        """
+        Drop everything if the books table changed since the rows were cached.
+        This catches writes by other processes sharing the database.
+        """
+        self._validated_at = time.monotonic()
+        if version != self._version:
+            self.invalidate_all()
+            self._version = version
+
+    def stats(self):
+        """Return the hit and miss counters, hit rate and current size"""
+        with self._books_lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+                'size': len(self._books),
+            }
@@ -0,0 +1,132 @@
+import os
+import csv
+import sys
+import json
+import time
+from Book import Book
+from DatabaseManager import DatabaseManager
+
+class CatalogImporter:
+    CHUNK_SIZE = 1000  # Books written per transaction
+    MAX_REPORTED_REJECTIONS = 100  # Rejected rows listed in the report (all are counted)
+    REQUIRED_FIELDS = ('ISBN', 'title', 'author', 'price', 'stock')
+
+    def __init__(self, chunk_size=CHUNK_SIZE):
+        """
+        Bulk import books from a CSV or JSONL feed.
+        The file is streamed row by row, each row is validated into a Book
+        and books are upserted on ISBN a chunk at a time, so memory use does
+        not grow with the size of the file.
+        """
+        if chunk_size < 1:
+            raise ValueError("Chunk size must be at least 1")
+        self.chunk_size = chunk_size
+        self.db_manager = DatabaseManager()
+
+    @staticmethod
+    def detect_format(path):
+        """Guess the feed format ('csv' or 'jsonl') from the file extension"""
+        extension = os.path.splitext(path)[1].lower()
+        if extension == '.csv':
+            return 'csv'
+        if extension in ('.jsonl', '.ndjson', '.json'):
+            return 'jsonl'
+        raise ValueError(f"Unknown catalog format: {extension or path}")
+
+    def read_rows(self, path, file_format=None):
+        """Yield (line number, row dictionary) for every record in the file"""
+        file_format = file_format or self.detect_format(path)
+        with open(path, newline='', encoding='utf-8') as f:
+            if file_format == 'csv':
+                reader = csv.DictReader(f)
+                for row in reader:
+                    yield reader.line_num, row
+            elif file_format == 'jsonl':
+                for line_number, line in enumerate(f, start=1):
+                    if not line.strip():
+                        continue
+                    try:
+                        row = json.loads(line)
+                    except json.JSONDecodeError as e:
+                        row = e  # Reported as a rejected row by validate
+                    yield line_number, row
+            else:
+                raise ValueError(f"Unknown catalog format: {file_format}")
+
+    def validate(self, row):
+        """Turn one feed row into a Book, raising ValueError if it is invalid"""
+        if isinstance(row, Exception):
+            raise ValueError(f"Invalid JSON: {row}")
+        if not isinstance(row, dict):
+            raise ValueError("Row is not an object")
+
+        def field(name, default=None):
+            value = row.get(name, default)
+            if isinstance(value, str):
+                value = value.strip()
+            return default if value in (None, '') else value
+
+        missing = [name for name in self.REQUIRED_FIELDS if field(name) is None]
+        if missing:
+            raise ValueError(f"Missing {', '.join(missing)}")
+
+        try:
+            price = float(field('price'))
+            stock = int(field('stock'))
+            popularity = int(field('popularity', 0))
+        except (TypeError, ValueError):
+            raise ValueError("Price, stock and popularity must be numbers")
+        if price < 0 or stock < 0:
+            raise ValueError("Price and stock cannot be negative")
+
+        return Book(str(field('ISBN')), field('title'), field('author'), price, popularity, stock,
+                    field('cover_image_path', field('cover_image')), field('edition'),
+                    field('category', 'Undefined'))
+
+    def import_file(self, path, file_format=None, progress=None):
+        """
+        Import every valid row of the file and return a report with the
+        number of books imported and rejected, the first rejected rows
+        (line number and reason), the elapsed time and the throughput.
+        progress(imported, rejected) is called after every chunk.
+        """
+        report = {'imported': 0, 'rejected': 0, 'rejections': []}
+        started = time.perf_counter()
+        chunk = []
+
+        def flush():
+            self.db_manager.upsert_books(chunk)
+            report['imported'] += len(chunk)
+            chunk.clear()
+            if progress is not None:
+                progress(report['imported'], report['rejected'])
+
+        for line_number, row in self.read_rows(path, file_format):
+            try:
+                chunk.append(self.validate(row))
+            except ValueError as e:
+                report['rejected'] += 1
+                if len(report['rejections']) < self.MAX_REPORTED_REJECTIONS:
+                    report['rejections'].append((line_number, str(e)))
+                continue
+            if len(chunk) >= self.chunk_size:
+                flush()
+        if chunk:
+            flush()
+
+        report['seconds'] = time.perf_counter() - started
+        report['rows_per_second'] = report['imported'] / report['seconds'] if report['seconds'] else 0.0
+        return report
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print("Usage: python CatalogImporter.py <catalog.csv|catalog.jsonl> [chunk size]")
+        sys.exit(1)
+
+    importer = CatalogImporter(int(sys.argv[2]) if len(sys.argv) > 2 else CatalogImporter.CHUNK_SIZE)
+    result = importer.import_file(sys.argv[1])
+    print(f"Imported {result['imported']} books, rejected {result['rejected']} rows "
+          f"in {result['seconds']:.2f}s ({result['rows_per_second']:.0f} books/s)")
+    for line_number, reason in result['rejections']:
+        print(f"  line {line_number}: {reason}")
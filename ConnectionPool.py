@@ -0,0 +1,52 @@
+import threading
+
+class ConnectionPool:
+    def __init__(self, connect):
+        """
+        Hand every thread its own database connection.
+        sqlite3 connections must not be used by two threads at once, so each
+        thread gets a connection opened with connect() on first use and keeps
+        it for its lifetime. close_all closes every connection handed out.
+        """
+        self._connect = connect
+        self._local = threading.local()
+        self._connections = []  # Every open connection, for close_all
+        self._lock = threading.Lock()
+
+    def get(self):
+        """Return the calling thread's connection, opening it if needed"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = self._connect()
+            self._local.conn = conn
+            with self._lock:
+                self._connections.append(conn)
+        return conn
+
+    def has_connection(self):
+        """Return True if the calling thread already has a connection"""
+        return getattr(self._local, 'conn', None) is not None
+
+    def connections(self):
+        """Return every connection currently handed out"""
+        with self._lock:
+            return list(self._connections)
+
+    def release(self):
+        """Close the calling thread's connection (e.g. before a worker thread exits)"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            return
+        self._local.conn = None
+        with self._lock:
+            if conn in self._connections:
+                self._connections.remove(conn)
+        conn.close()
+
+    def close_all(self):
+        """Close every connection the pool handed out"""
+        with self._lock:
+            connections, self._connections = self._connections, []
+        for conn in connections:
+            conn.close()
+        self._local = threading.local()
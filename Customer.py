@@ -39,6 +39,28 @@ class Customer (User):
         db_manager.execute_query(query, (phone, self.username))
         self.phone = phone
 
+    def update_profile(self, username=None, password=None, address=None, phone=None):
+        """
+        Apply several profile changes as one transaction.
+        Only the provided values are updated; if any update fails none of
+        them are kept, in the database or on this object.
+        """
+        original = (self.username, self.password, self.address, self.phone)
+        db_manager = DatabaseManager()
+        try:
+            with db_manager.transaction():
+                if username:
+                    self.update_username(username)
+                if password:
+                    self.update_password(password)
+                if address:
+                    self.update_address(address)
+                if phone:
+                    self.update_phone(phone)
+        except Exception:
+            self.username, self.password, self.address, self.phone = original
+            raise
+
     def add_to_cart(self, book_isbn):
         if book_isbn in self.cart:
             self.cart[book_isbn] += 1
@@ -74,22 +96,20 @@ class Customer (User):
             order.book_list = []
             order.shipping_method = shipping_type
             
-            # Add books from cart to order
+            # Price the whole cart in one batched lookup; each cart entry
+            # becomes a single line carrying its quantity
             db_manager = DatabaseManager()
-            total = 0
-            
+            books = db_manager.get_books(self.cart.keys())
+
             for book_isbn, quantity in self.cart.items():
-                query = "SELECT title, price FROM books WHERE ISBN = ?"
-                book_data = db_manager.fetch_one_entry(query, (book_isbn,))
+                book_data = books.get(book_isbn)
                 if book_data:
-                    for _ in range(quantity):
-                        book_info = {
-                            'isbn': book_isbn,
-                            'title': book_data[0],
-                            'price': book_data[1]
-                        }
-                        order.book_list.append(book_info)
-                        total += book_data[1]
+                    order.book_list.append({
+                        'isbn': book_isbn,
+                        'title': book_data.title,
+                        'price': book_data.price,
+                        'quantity': quantity
+                    })
 
             # Apply decorators if specified
             if gift_note:
@@ -123,7 +143,7 @@ class Customer (User):
 
     def cancel_order(self, order_id):
         """
-        Cancel an order if it's in pending status
+        Cancel an order if it's in pending status, giving its reserved stock back
         Args:
             order_id: The ID of the order to cancel
         Raises:
@@ -132,23 +152,27 @@ class Customer (User):
         try:
             db_manager = DatabaseManager()
             
-            # Check if order exists and belongs to this customer
-            query = """
-            SELECT status 
-            FROM orders 
-            WHERE order_id = ? AND customer_username = ?
-            """
-            order_status = db_manager.fetch_one_entry(query, (order_id, self.username))
-            
-            if not order_status:
-                raise Exception("Order not found or doesn't belong to you")
-            
-            if order_status[0].lower() != 'pending':
-                raise Exception("Only pending orders can be cancelled")
-            
-            # Update order status to cancelled
-            update_query = "UPDATE orders SET status = 'Cancelled' WHERE order_id = ?"
-            db_manager.execute_query(update_query, (order_id,))
+            # Check and cancel under the write lock so a concurrent
+            # confirmation cannot slip in between
+            with db_manager.transaction():
+                # Check if order exists and belongs to this customer
+                query = """
+                SELECT status 
+                FROM orders 
+                WHERE order_id = ? AND customer_username = ?
+                """
+                order_status = db_manager.fetch_one_entry(query, (order_id, self.username))
+                
+                if not order_status:
+                    raise Exception("Order not found or doesn't belong to you")
+                
+                if order_status[0].lower() != 'pending':
+                    raise Exception("Only pending orders can be cancelled")
+                
+                # Update order status to cancelled and release its stock
+                update_query = "UPDATE orders SET status = 'Cancelled' WHERE order_id = ?"
+                db_manager.execute_query(update_query, (order_id,))
+                db_manager.release_reservations([order_id])
             
         except Exception as e:
             raise Exception(f"Failed to cancel order: {str(e)}")
@@ -1,24 +1,480 @@
+import os
+import time
 import sqlite3
+import threading
 from sqlite3 import Error
+from contextlib import contextmanager
+from ConnectionPool import ConnectionPool
+from RowRecord import RowRecord
+from CatalogCache import CatalogCache
+from QueryTracer import QueryTracer, TracedConnection
 
 class DatabaseManager:
     _instance = None  # To hold the single instance of the class
+    _lock = threading.Lock()
+    MAX_QUERY_PARAMS = 500  # Stay well below SQLite's bound-parameter limit
+    ITER_BATCH_SIZE = 500  # Rows fetched at a time by iter_entries
+
+    # Several GUI instances share the database file: WAL lets readers and
+    # the writer work at the same time, and writers wait (then retry with
+    # backoff) instead of failing at once with "database is locked"
+    DB_PATH = 'bookstore.db'
+    BUSY_TIMEOUT_MS = 5000  # How long SQLite waits for a lock before SQLITE_BUSY
+    BUSY_RETRIES = 5  # Extra attempts for a write that still hit SQLITE_BUSY
+    BUSY_BACKOFF_S = 0.05  # First retry delay, doubled on every attempt
+
+    RESERVATION_MINUTES = 30  # Default for how long checkout holds stock for a pending order
+    RESERVATION_ENV_VAR = 'BOOKSTORE_RESERVATION_MINUTES'  # Overrides RESERVATION_MINUTES
+
+    TRACE_ENV_VAR = 'BOOKSTORE_SQL_TRACE'  # 1/true to trace SQL, or the slow-query threshold in ms
+
+    # SQL expressions for the start of the current day, week (Monday) and
+    # month, which key the sales rollups
+    PERIOD_STARTS = {
+        'day': "date('now')",
+        'week': "date('now', 'weekday 0', '-6 days')",
+        'month': "date('now', 'start of month')",
+    }
+    CURRENT_PERIODS = " UNION ALL ".join(
+        f"SELECT '{period}' AS period, {start} AS period_start" for period, start in PERIOD_STARTS.items()
+    )
+
+    # Repopulates the full-text search index from the books table
+    REBUILD_SEARCH_INDEX = [
+        "DELETE FROM books_fts",
+        """INSERT INTO books_fts (rowid, ISBN, title, author, category, reviews)
+           SELECT b.rowid, b.ISBN, b.title, b.author, b.category,
+                  (SELECT group_concat(r.review, ' ') FROM book_reviews r WHERE r.ISBN = b.ISBN)
+           FROM books b""",
+    ]
+
+    # Schema migrations applied on top of create_tables, in order.
+    # Each entry is (version, statements); the last applied version is
+    # recorded in PRAGMA user_version so every migration runs only once.
+    # A statement given as (table, column, definition) adds that column
+    # unless it already exists, so re-running a migration is harmless.
+    MIGRATIONS = [
+        (1, [
+            # view_customer_orders / view_purchased_books
+            """CREATE INDEX IF NOT EXISTS idx_orders_customer_status
+               ON orders (customer_username, status, shipping_method, total)""",
+            # Orders containing a given book
+            """CREATE INDEX IF NOT EXISTS idx_order_books_isbn
+               ON order_books (book_isbn, order_id, quantity)""",
+            # top_categories
+            """CREATE INDEX IF NOT EXISTS idx_books_category_sold
+               ON books (category, sold)""",
+            # top_selling_books
+            """CREATE INDEX IF NOT EXISTS idx_books_sold
+               ON books (sold DESC)""",
+            # stock_level
+            """CREATE INDEX IF NOT EXISTS idx_books_stock
+               ON books (stock DESC, ISBN, title)""",
+        ]),
+        (2, [
+            # Full-text search index over books and their reviews. Rows share
+            # the rowid of their book and are kept in sync by the triggers below.
+            """CREATE VIRTUAL TABLE IF NOT EXISTS books_fts USING fts5(
+                   ISBN UNINDEXED, title, author, category, reviews,
+                   tokenize = 'unicode61 remove_diacritics 2',
+                   prefix = '2 3'
+               )""",
+            """CREATE TRIGGER IF NOT EXISTS books_fts_insert AFTER INSERT ON books BEGIN
+                   INSERT INTO books_fts (rowid, ISBN, title, author, category, reviews)
+                   VALUES (new.rowid, new.ISBN, new.title, new.author, new.category,
+                           (SELECT group_concat(review, ' ') FROM book_reviews WHERE ISBN = new.ISBN));
+               END""",
+            """CREATE TRIGGER IF NOT EXISTS books_fts_update
+               AFTER UPDATE OF ISBN, title, author, category ON books BEGIN
+                   UPDATE books_fts
+                   SET ISBN = new.ISBN, title = new.title, author = new.author, category = new.category
+                   WHERE rowid = old.rowid;
+               END""",
+            """CREATE TRIGGER IF NOT EXISTS books_fts_delete AFTER DELETE ON books BEGIN
+                   DELETE FROM books_fts WHERE rowid = old.rowid;
+               END""",
+            """CREATE TRIGGER IF NOT EXISTS book_reviews_fts_insert AFTER INSERT ON book_reviews BEGIN
+                   UPDATE books_fts
+                   SET reviews = (SELECT group_concat(review, ' ') FROM book_reviews WHERE ISBN = new.ISBN)
+                   WHERE rowid = (SELECT rowid FROM books WHERE ISBN = new.ISBN);
+               END""",
+            """CREATE TRIGGER IF NOT EXISTS book_reviews_fts_delete AFTER DELETE ON book_reviews BEGIN
+                   UPDATE books_fts
+                   SET reviews = (SELECT group_concat(review, ' ') FROM book_reviews WHERE ISBN = old.ISBN)
+                   WHERE rowid = (SELECT rowid FROM books WHERE ISBN = old.ISBN);
+               END""",
+            *REBUILD_SEARCH_INDEX,
+        ]),
+        (3, [
+            # Keyset pagination of the browse grid by (title, ISBN)
+            """CREATE INDEX IF NOT EXISTS idx_books_title_isbn
+               ON books (title, ISBN)""",
+            """CREATE INDEX IF NOT EXISTS idx_books_category_title_isbn
+               ON books (category, title, ISBN)""",
+        ]),
+        (4, [
+            # Change detection: a version counter per table, bumped by triggers.
+            # Every order is stamped with the version of its last change so
+            # views can fetch just the orders changed since they last looked.
+            """CREATE TABLE IF NOT EXISTS table_versions (
+                   table_name TEXT PRIMARY KEY,
+                   version INTEGER NOT NULL DEFAULT 0
+               )""",
+            "INSERT OR IGNORE INTO table_versions (table_name) VALUES ('orders'), ('books')",
+            ("orders", "row_version", "INTEGER NOT NULL DEFAULT 0"),
+            "CREATE INDEX IF NOT EXISTS idx_orders_row_version ON orders (row_version)",
+            """CREATE TRIGGER IF NOT EXISTS orders_version_insert AFTER INSERT ON orders BEGIN
+                   UPDATE table_versions SET version = version + 1 WHERE table_name = 'orders';
+                   UPDATE orders
+                   SET row_version = (SELECT version FROM table_versions WHERE table_name = 'orders')
+                   WHERE order_id = new.order_id;
+               END""",
+            """CREATE TRIGGER IF NOT EXISTS orders_version_update
+               AFTER UPDATE OF customer_username, status, total, shipping_method, gift_note, customization
+               ON orders BEGIN
+                   UPDATE table_versions SET version = version + 1 WHERE table_name = 'orders';
+                   UPDATE orders
+                   SET row_version = (SELECT version FROM table_versions WHERE table_name = 'orders')
+                   WHERE order_id = new.order_id;
+               END""",
+            """CREATE TRIGGER IF NOT EXISTS books_version_insert AFTER INSERT ON books BEGIN
+                   UPDATE table_versions SET version = version + 1 WHERE table_name = 'books';
+               END""",
+            """CREATE TRIGGER IF NOT EXISTS books_version_update AFTER UPDATE ON books BEGIN
+                   UPDATE table_versions SET version = version + 1 WHERE table_name = 'books';
+               END""",
+            """CREATE TRIGGER IF NOT EXISTS books_version_delete AFTER DELETE ON books BEGIN
+                   UPDATE table_versions SET version = version + 1 WHERE table_name = 'books';
+               END""",
+        ]),
+        (5, [
+            # Sales aggregates kept current by triggers on books, so the
+            # statistics read one row per category instead of every book.
+            # Books without a category are counted under ''.
+            """CREATE TABLE IF NOT EXISTS category_sales (
+                   category TEXT PRIMARY KEY,
+                   total_sold INTEGER NOT NULL DEFAULT 0,
+                   book_count INTEGER NOT NULL DEFAULT 0
+               )""",
+            """CREATE TABLE IF NOT EXISTS sales_totals (
+                   id INTEGER PRIMARY KEY CHECK (id = 1),
+                   total_sold INTEGER NOT NULL DEFAULT 0
+               )""",
+            "DELETE FROM category_sales",
+            """INSERT INTO category_sales (category, total_sold, book_count)
+               SELECT IFNULL(category, ''), IFNULL(SUM(sold), 0), COUNT(*)
+               FROM books
+               GROUP BY IFNULL(category, '')""",
+            """INSERT OR REPLACE INTO sales_totals (id, total_sold)
+               SELECT 1, IFNULL(SUM(sold), 0) FROM books""",
+            """CREATE TRIGGER IF NOT EXISTS books_sales_insert AFTER INSERT ON books BEGIN
+                   INSERT INTO category_sales (category, total_sold, book_count)
+                   VALUES (IFNULL(new.category, ''), IFNULL(new.sold, 0), 1)
+                   ON CONFLICT (category) DO UPDATE
+                   SET total_sold = total_sold + excluded.total_sold,
+                       book_count = book_count + 1;
+                   UPDATE sales_totals SET total_sold = total_sold + IFNULL(new.sold, 0) WHERE id = 1;
+               END""",
+            """CREATE TRIGGER IF NOT EXISTS books_sales_update AFTER UPDATE OF sold, category ON books BEGIN
+                   UPDATE category_sales
+                   SET total_sold = total_sold - IFNULL(old.sold, 0), book_count = book_count - 1
+                   WHERE category = IFNULL(old.category, '');
+                   INSERT INTO category_sales (category, total_sold, book_count)
+                   VALUES (IFNULL(new.category, ''), IFNULL(new.sold, 0), 1)
+                   ON CONFLICT (category) DO UPDATE
+                   SET total_sold = total_sold + excluded.total_sold,
+                       book_count = book_count + 1;
+                   UPDATE sales_totals
+                   SET total_sold = total_sold - IFNULL(old.sold, 0) + IFNULL(new.sold, 0)
+                   WHERE id = 1;
+               END""",
+            """CREATE TRIGGER IF NOT EXISTS books_sales_delete AFTER DELETE ON books BEGIN
+                   UPDATE category_sales
+                   SET total_sold = total_sold - IFNULL(old.sold, 0), book_count = book_count - 1
+                   WHERE category = IFNULL(old.category, '');
+                   UPDATE sales_totals SET total_sold = total_sold - IFNULL(old.sold, 0) WHERE id = 1;
+               END""",
+        ]),
+        (6, [
+            # Order timestamps (UTC) and a history of every status change
+            ("orders", "created_at", "TEXT"),
+            """CREATE TABLE IF NOT EXISTS order_status_history (
+                   order_id INTEGER NOT NULL,
+                   status TEXT NOT NULL,
+                   changed_at TEXT NOT NULL DEFAULT (strftime('%Y-%m-%d %H:%M:%S', 'now')),
+                   FOREIGN KEY (order_id) REFERENCES orders(order_id)
+               )""",
+            """CREATE INDEX IF NOT EXISTS idx_order_status_history_order
+               ON order_status_history (order_id, changed_at)""",
+            """CREATE TRIGGER IF NOT EXISTS orders_created_at AFTER INSERT ON orders BEGIN
+                   UPDATE orders
+                   SET created_at = IFNULL(new.created_at, strftime('%Y-%m-%d %H:%M:%S', 'now'))
+                   WHERE order_id = new.order_id;
+                   INSERT INTO order_status_history (order_id, status) VALUES (new.order_id, new.status);
+               END""",
+            """CREATE TRIGGER IF NOT EXISTS orders_status_history AFTER UPDATE OF status ON orders
+               WHEN new.status IS NOT old.status BEGIN
+                   INSERT INTO order_status_history (order_id, status) VALUES (new.order_id, new.status);
+               END""",
+
+            # Sales per day/week/month, per book and per category, added to
+            # when an order is confirmed (the same moment books.sold grows)
+            """CREATE TABLE IF NOT EXISTS sales_rollups (
+                   period TEXT NOT NULL CHECK (period IN ('day', 'week', 'month')),
+                   period_start TEXT NOT NULL,
+                   ISBN TEXT NOT NULL,
+                   quantity INTEGER NOT NULL DEFAULT 0,
+                   PRIMARY KEY (period, period_start, ISBN)
+               )""",
+            """CREATE TABLE IF NOT EXISTS category_sales_rollups (
+                   period TEXT NOT NULL CHECK (period IN ('day', 'week', 'month')),
+                   period_start TEXT NOT NULL,
+                   category TEXT NOT NULL,
+                   quantity INTEGER NOT NULL DEFAULT 0,
+                   PRIMARY KEY (period, period_start, category)
+               )""",
+            f"""CREATE TRIGGER IF NOT EXISTS orders_sales_rollups AFTER UPDATE OF status ON orders
+               WHEN LOWER(new.status) = 'confirmed' AND LOWER(old.status) IS NOT 'confirmed' BEGIN
+                   INSERT INTO sales_rollups (period, period_start, ISBN, quantity)
+                   SELECT p.period, p.period_start, ob.book_isbn, SUM(ob.quantity)
+                   FROM order_books ob, ({CURRENT_PERIODS}) p
+                   WHERE ob.order_id = new.order_id
+                   GROUP BY p.period, ob.book_isbn
+                   ON CONFLICT (period, period_start, ISBN) DO UPDATE
+                   SET quantity = quantity + excluded.quantity;
+                   INSERT INTO category_sales_rollups (period, period_start, category, quantity)
+                   SELECT p.period, p.period_start, IFNULL(b.category, ''), SUM(ob.quantity)
+                   FROM order_books ob
+                   JOIN books b ON b.ISBN = ob.book_isbn,
+                   ({CURRENT_PERIODS}) p
+                   WHERE ob.order_id = new.order_id
+                   GROUP BY p.period, IFNULL(b.category, '')
+                   ON CONFLICT (period, period_start, category) DO UPDATE
+                   SET quantity = quantity + excluded.quantity;
+               END""",
+        ]),
+        (7, [
+            # Stock held by pending orders: taken from books.stock at checkout,
+            # given back when the order is cancelled or the hold expires, and
+            # turned into sold when the order is confirmed
+            """CREATE TABLE IF NOT EXISTS stock_reservations (
+                   order_id INTEGER NOT NULL,
+                   ISBN TEXT NOT NULL,
+                   quantity INTEGER NOT NULL CHECK (quantity > 0),
+                   expires_at TEXT NOT NULL,
+                   PRIMARY KEY (order_id, ISBN),
+                   FOREIGN KEY (order_id) REFERENCES orders(order_id)
+               )""",
+            """CREATE INDEX IF NOT EXISTS idx_stock_reservations_expires
+               ON stock_reservations (expires_at)""",
+        ]),
+        (8, [
+            # The price each book was sold at; NULL for orders placed before
+            ("order_books", "unit_price", "REAL"),
+        ]),
+    ]
+
+    # Top 3 categories by books sold, read from the trigger-maintained aggregate
+    TOP_CATEGORIES_QUERY = """
+    SELECT NULLIF(category, '') AS category, total_sold
+    FROM category_sales
+    WHERE book_count > 0
+    ORDER BY total_sold DESC
+    LIMIT 3;
+    """
+
+    # Columns returned by search_books, in the order the GUI expects
+    BOOK_LISTING_COLUMNS = "ISBN, title, author, price, stock, edition, category, cover_image_path, sold"
     
     def __new__(cls):
         """Singleton pattern to ensure only one instance of DatabaseManager"""
-        if cls._instance is None:
-            cls._instance = super(DatabaseManager, cls).__new__(cls)
-            cls._instance._initialize_db()
+        with cls._lock:
+            if cls._instance is None:
+                cls._instance = super(DatabaseManager, cls).__new__(cls)
+                cls._instance._initialize_db()
         return cls._instance
 
     def _initialize_db(self):
         """Initialize the database and create tables if they do not exist"""
+        # Every thread gets its own write and read connection (and its own
+        # transaction state), so background threads can use the same
+        # DatabaseManager as the Tk thread
+        self._local = threading.local()
+        self.busy_timeout_ms = self.BUSY_TIMEOUT_MS
+        self.reservation_minutes = self.RESERVATION_MINUTES
+        reservation_setting = os.environ.get(self.RESERVATION_ENV_VAR)
+        if reservation_setting:
+            try:
+                self.set_reservation_minutes(reservation_setting)
+            except ValueError as e:
+                print(f"Ignoring {self.RESERVATION_ENV_VAR}: {e}")
+        self._write_pool = ConnectionPool(self._open_write_connection)
+        self._read_pool = ConnectionPool(self._open_read_connection)
+        self.tracer = None
+        threshold = self._trace_threshold(os.environ.get(self.TRACE_ENV_VAR, ''))
+        if threshold is not None:
+            self.enable_tracing(threshold)
         try:
-            self.conn = sqlite3.connect('bookstore.db')
-            self.cursor = self.conn.cursor()
+            self.cursor.execute("PRAGMA journal_mode = WAL")
             self.create_tables()
         except Error as e:
             print(f"Error initializing the database: {e}")
+
+    def _open_write_connection(self):
+        """Open a connection for schema changes, inserts and updates"""
+        conn = sqlite3.connect(self.DB_PATH, timeout=self.busy_timeout_ms / 1000,
+                               check_same_thread=False, factory=TracedConnection)
+        conn.row_factory = RowRecord.row_factory
+        if self.tracer is not None:
+            conn.attach_tracer(self.tracer)
+        conn.execute("PRAGMA synchronous = NORMAL")
+        conn.execute(f"PRAGMA busy_timeout = {self.busy_timeout_ms}")
+        return conn
+
+    def _open_read_connection(self):
+        """Open a read-only connection; in WAL mode its queries never wait for the writer"""
+        conn = sqlite3.connect(f"file:{self.DB_PATH}?mode=ro", uri=True,
+                               timeout=self.busy_timeout_ms / 1000, check_same_thread=False,
+                               factory=TracedConnection)
+        conn.row_factory = RowRecord.row_factory
+        if self.tracer is not None:
+            conn.attach_tracer(self.tracer)
+        conn.execute(f"PRAGMA busy_timeout = {self.busy_timeout_ms}")
+        return conn
+
+    @property
+    def conn(self):
+        """The calling thread's write connection"""
+        return self._write_pool.get()
+
+    @property
+    def read_conn(self):
+        """The calling thread's read-only connection"""
+        return self._read_pool.get()
+
+    @property
+    def cursor(self):
+        """
+        The calling thread's cursor on its write connection, used by
+        transaction() and the statements run inside it.
+        """
+        cursor = getattr(self._local, 'cursor', None)
+        if cursor is None or cursor.connection is not self.conn:
+            cursor = self._local.cursor = self.conn.cursor()
+        return cursor
+
+    @property
+    def _transaction_depth(self):
+        """Nesting level of the calling thread's transaction() blocks"""
+        return getattr(self._local, 'transaction_depth', 0)
+
+    @_transaction_depth.setter
+    def _transaction_depth(self, depth):
+        self._local.transaction_depth = depth
+
+    def set_busy_timeout(self, milliseconds):
+        """
+        Set how long connections wait for a lock before giving up.
+        Applies to the calling thread's connections and every one opened later.
+        """
+        self.busy_timeout_ms = int(milliseconds)
+        for pool in (self._write_pool, self._read_pool):
+            if pool.has_connection():
+                pool.get().execute(f"PRAGMA busy_timeout = {self.busy_timeout_ms}")
+
+    def set_reservation_minutes(self, minutes):
+        """Set how long checkout holds stock for an order (applies to orders placed later)"""
+        minutes = int(minutes)
+        if minutes < 1:
+            raise ValueError("Reservations must last at least one minute")
+        self.reservation_minutes = minutes
+
+    @staticmethod
+    def _trace_threshold(setting):
+        """
+        Read the BOOKSTORE_SQL_TRACE setting: None when tracing is off
+        (unset, 0, false, no, off), otherwise the slow-query threshold in ms
+        (QueryTracer.SLOW_QUERY_MS for 1/true/yes/on).
+        """
+        setting = setting.strip().lower()
+        if setting in ('', '0', 'false', 'no', 'off'):
+            return None
+        if setting in ('1', 'true', 'yes', 'on'):
+            return QueryTracer.SLOW_QUERY_MS
+        try:
+            threshold = int(setting)
+        except ValueError:
+            threshold = 0
+        if threshold < 1:
+            print(f"Ignoring {DatabaseManager.TRACE_ENV_VAR}={setting!r}: expected 1/true or a threshold in ms")
+            return None
+        return threshold
+
+    def enable_tracing(self, slow_query_ms=QueryTracer.SLOW_QUERY_MS,
+                       slow_log_path=QueryTracer.SLOW_LOG_PATH):
+        """
+        Start recording per-statement SQL statistics on every connection
+        (see QueryTracer) and return the tracer. Tracing is off by default;
+        it can also be switched on with the BOOKSTORE_SQL_TRACE variable.
+        """
+        if self.tracer is None:
+            self.tracer = QueryTracer(slow_query_ms, slow_log_path)
+        else:
+            self.tracer.slow_query_ms = slow_query_ms
+            self.tracer.slow_log_path = slow_log_path
+        for conn in self._write_pool.connections() + self._read_pool.connections():
+            conn.attach_tracer(self.tracer)
+        self._local.cursor = None  # Reopened as a tracing cursor
+        return self.tracer
+
+    def disable_tracing(self):
+        """Stop tracing; the statistics collected so far stay on the returned tracer"""
+        tracer, self.tracer = self.tracer, None
+        for conn in self._write_pool.connections() + self._read_pool.connections():
+            conn.attach_tracer(None)
+        self._local.cursor = None
+        return tracer
+
+    def release_thread_connections(self):
+        """Close the calling thread's connections, e.g. when a worker thread is done"""
+        self._local.cursor = None
+        self._write_pool.release()
+        self._read_pool.release()
+
+    def _reader(self):
+        """
+        Return a new cursor for one read.
+        Inside a transaction reads go through the write connection so they
+        see the transaction's own uncommitted changes.
+        """
+        if self._transaction_depth > 0:
+            return self.conn.cursor()
+        return self.read_conn.cursor()
+
+    @staticmethod
+    def _is_busy_error(error):
+        """Return True if error means another connection holds the lock"""
+        code = getattr(error, 'sqlite_errorcode', None)
+        if code is not None:
+            return code & 0xff in (sqlite3.SQLITE_BUSY, sqlite3.SQLITE_LOCKED)
+        message = str(error).lower()
+        return 'locked' in message or 'busy' in message
+
+    def _with_busy_retry(self, operation):
+        """
+        Run operation (a write in its own transaction) and retry it with
+        exponential backoff while the database is busy. Inside an enclosing
+        transaction it runs once, as only the outermost block can retry.
+        """
+        if self._transaction_depth > 0:
+            return operation()
+        for attempt in range(self.BUSY_RETRIES + 1):
+            try:
+                return operation()
+            except sqlite3.OperationalError as e:
+                if attempt == self.BUSY_RETRIES or not self._is_busy_error(e):
+                    raise
+                time.sleep(self.BUSY_BACKOFF_S * 2 ** attempt)
         
     def create_tables(self):
         """Create the tables if they do not exist"""
@@ -91,23 +547,124 @@ class DatabaseManager:
             self.conn.commit()
         except Error as e:
             print(f"Error creating tables: {e}")
+            return
 
-    def execute_query(self, query, params=None):
-        """Executes a query"""
-        if params:
-            self.cursor.execute(query, params)
+        self.migrate()
+
+    def get_schema_version(self):
+        """Return the schema version recorded in PRAGMA user_version"""
+        return self.fetch_one_entry("PRAGMA user_version")[0]
+
+    def _add_column(self, table, column, definition):
+        """Add column to table unless it is already there (ALTER TABLE has no IF NOT EXISTS)"""
+        columns = [row[1] for row in self.cursor.execute(f"PRAGMA table_info({table})").fetchall()]
+        if column not in columns:
+            self.cursor.execute(f"ALTER TABLE {table} ADD COLUMN {column} {definition}")
+
+    def migrate(self):
+        """
+        Apply every pending migration, each in its own transaction.
+        The version is read again once the write lock is held, so when
+        several processes start together each migration runs only once and
+        the recorded version never goes back.
+        """
+        applied = False
+        try:
+            for version, statements in self.MIGRATIONS:
+                if version <= self.get_schema_version():
+                    continue
+                with self.transaction():
+                    current_version = self.cursor.execute("PRAGMA user_version").fetchone()[0]
+                    if version <= current_version:
+                        continue  # Applied by another process meanwhile
+                    for statement in statements:
+                        if isinstance(statement, tuple):
+                            self._add_column(*statement)
+                        else:
+                            self.cursor.execute(statement)
+                    self.cursor.execute(f"PRAGMA user_version = {int(version)}")
+                applied = True
+            if applied:
+                # Refresh planner statistics so the new indexes get used
+                self.execute_query("ANALYZE")
+        except Error as e:
+            print(f"Error migrating the database: {e}")
+
+    @contextmanager
+    def transaction(self):
+        """
+        Group several statements into a single unit of work.
+        The outermost block commits once on success and rolls back on error;
+        nested blocks use savepoints so they can roll back on their own.
+        Statements executed inside a block are not committed individually.
+        The write lock is taken when the block starts (BEGIN IMMEDIATE), so
+        a busy database is reported up front rather than halfway through.
+        """
+        depth = self._transaction_depth
+        savepoint = f"sp_{depth}"
+        if depth == 0:
+            if not self.conn.in_transaction:
+                self.cursor.execute("BEGIN IMMEDIATE")
+        else:
+            self.cursor.execute(f"SAVEPOINT {savepoint}")
+        self._transaction_depth += 1
+        try:
+            yield self
+        except BaseException:
+            self._transaction_depth = depth
+            if depth == 0:
+                self.conn.rollback()
+            else:
+                self.cursor.execute(f"ROLLBACK TO SAVEPOINT {savepoint}")
+                self.cursor.execute(f"RELEASE SAVEPOINT {savepoint}")
+            raise
+        self._transaction_depth = depth
+        if depth == 0:
+            self.conn.commit()
         else:
-            self.cursor.execute(query)
-        self.conn.commit()
+            self.cursor.execute(f"RELEASE SAVEPOINT {savepoint}")
+
+    def in_transaction(self):
+        """Return True while inside a transaction() block"""
+        return self._transaction_depth > 0
+
+    def execute_query(self, query, params=None):
+        """
+        Executes a query (committed immediately unless inside a transaction).
+        Retried with backoff while another connection holds the write lock.
+        """
+        def run():
+            with self.transaction():
+                cursor = self.conn.cursor()
+                if params:
+                    cursor.execute(query, params)
+                else:
+                    cursor.execute(query)
+
+        self._with_busy_retry(run)
+
+    def execute_transaction(self, statements):
+        """
+        Execute several (query, params) statements as one transaction.
+        Everything is committed together, or rolled back if any statement fails.
+        """
+        def run():
+            with self.transaction():
+                cursor = self.conn.cursor()
+                for query, params in statements:
+                    cursor.execute(query, params or ())
+
+        self._with_busy_retry(run)
 
     def fetch_one_entry(self, query, params=None):
         """Fetch a single entry from the database."""
         try:
+            cursor = self._reader()
             if params:
-                self.cursor.execute(query, params)
+                cursor.execute(query, params)
             else:
-                self.cursor.execute(query)
-            result = self.cursor.fetchone()
+                cursor.execute(query)
+            result = cursor.fetchone()
             return result
         except Error as e:
             print(f"Error fetching one entry: {e}")
@@ -116,11 +673,12 @@ class DatabaseManager:
     def fetch_all_entries(self, query, params=None):
         """Fetch multiple or all entries from the database."""
         try:
+            cursor = self._reader()
             if params:
-                self.cursor.execute(query, params)
+                cursor.execute(query, params)
             else:
-                self.cursor.execute(query)
-            results = self.cursor.fetchall()
+                cursor.execute(query)
+            results = cursor.fetchall()
             return results
         except Error as e:
             print(f"Error fetching all entries: {e}")
@@ -132,8 +690,7 @@ class DatabaseManager:
         """Insert a user (customer or admin) into the database"""
         try:
             query = "INSERT INTO users (username, password, role, address, phone) VALUES (?, ?, ?, ?, ?)"
-            self.cursor.execute(query, (username, password, role, address, phone))
-            self.conn.commit()
+            self.execute_query(query, (username, password, role, address, phone))
             print(f"{role.capitalize()} {username} inserted successfully.")
         except Error as e:
             print(f"Error inserting user: {e}")
@@ -146,7 +703,7 @@ class DatabaseManager:
             INSERT INTO books (ISBN, title, author, price, popularity, stock, cover_image_path, edition, category) 
             VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
             """
-            self.cursor.execute(query, (
+            self.execute_query(query, (
                 book.getisbn(),
                 book.gettitle(),
                 book.getauthor(),
@@ -157,12 +714,70 @@ class DatabaseManager:
                 book.getedition(),
                 book.getcategory()
             ))
-            self.conn.commit()
+            CatalogCache().invalidate(book.getisbn())
             print(f"Book {book.gettitle()} inserted successfully.")
         except Error as e:
             print(f"Error inserting book: {e}")
+
+    def upsert_books(self, books):
+        """
+        Insert a batch of Book instances in one transaction, updating the
+        books whose ISBN already exists (their sold count is kept).
+        """
+        query = """
+        INSERT INTO books (ISBN, title, author, price, popularity, stock, cover_image_path, edition, category)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+        ON CONFLICT (ISBN) DO UPDATE
+        SET title = excluded.title,
+            author = excluded.author,
+            price = excluded.price,
+            popularity = excluded.popularity,
+            stock = excluded.stock,
+            cover_image_path = excluded.cover_image_path,
+            edition = excluded.edition,
+            category = excluded.category
+        """
+        rows = [(
+            book.getisbn(),
+            book.gettitle(),
+            book.getauthor(),
+            book.getprice(),
+            book.getpopularity(),
+            book.getstock(),
+            book.getcover_image(),
+            book.getedition(),
+            book.getcategory()
+        ) for book in books]
+
+        def run():
+            with self.transaction():
+                self.conn.cursor().executemany(query, rows)
+
+        self._with_busy_retry(run)
+        CatalogCache().invalidate(*(row[0] for row in rows))
     
 
+    def iter_entries(self, query, params=None, batch_size=ITER_BATCH_SIZE):
+        """
+        Yield the rows of a query, fetched batch_size rows at a time, so
+        memory stays bounded by the batch rather than the result size.
+        The rows come from a cursor of their own, closed as soon as the
+        iteration ends, fails or is closed early (wrap the generator in
+        contextlib.closing for that). Errors are raised, not printed, so a
+        partial result is never mistaken for a complete one. Consume the
+        generator on the thread that created it.
+        """
+        cursor = self._reader()
+        try:
+            cursor.execute(query, params or ())
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    break
+                yield from rows
+        finally:
+            cursor.close()
+
     # Methods for managing orders
     def insert_order(self, order):
         """Insert an order into the database using an Order object"""
@@ -177,73 +792,337 @@ class DatabaseManager:
             gift_note = getattr(order, 'note', None)  # Default to None if not present
             customization = getattr(order, 'customization_name', None)  # Default to None if not present
 
-            # Insert order record
+            # Merge order lines by ISBN (a line carries its own quantity)
+            book_quantities = {}
+            titles = {}
+            prices = {}
+            for book in order.book_list:
+                isbn = book['isbn']
+                book_quantities[isbn] = book_quantities.get(isbn, 0) + book.get('quantity', 1)
+                titles[isbn] = book.get('title', isbn)
+                prices.setdefault(isbn, book.get('price'))
+
+            # Insert order record, its books and its stock reservations as one unit of work
             query = """
             INSERT INTO orders (customer_username, status, total, shipping_method, gift_note, customization)
             VALUES (?, ?, ?, ?, ?, ?)
             """
-            self.cursor.execute(query, (
-                customer_username,
-                status,
-                total,
-                shipping_method,
-                gift_note,
-                customization
-            ))
-            order_id = self.cursor.lastrowid
+            def write_order():
+                with self.transaction():
+                    cursor = self.conn.cursor()
 
-            # Create a dictionary to track book quantities
-            book_quantities = {}
-            for book in order.book_list:
-                isbn = book['isbn']
-                if isbn in book_quantities:
-                    book_quantities[isbn] += 1
-                else:
-                    book_quantities[isbn] = 1
+                    # Reserve stock with one conditional update per book; if any
+                    # book is short the whole order rolls back
+                    for isbn, quantity in book_quantities.items():
+                        cursor.execute("UPDATE books SET stock = stock - ? WHERE ISBN = ? AND stock >= ?",
+                                       (quantity, isbn, quantity))
+                        if cursor.rowcount != 1:
+                            raise ValueError(f"Not enough stock for {titles[isbn]}")
 
-            # Insert the books in the order_books table with their quantities
-            for isbn, quantity in book_quantities.items():
-                query = "INSERT INTO order_books (order_id, book_isbn, quantity) VALUES (?, ?, ?)"
-                self.cursor.execute(query, (order_id, isbn, quantity))
-            
-            self.conn.commit()
+                    cursor.execute(query, (
+                        customer_username,
+                        status,
+                        total,
+                        shipping_method,
+                        gift_note,
+                        customization
+                    ))
+                    order_id = cursor.lastrowid
+
+                    # Insert the books in the order_books table with their quantities
+                    # and the price they were sold at
+                    books_query = """
+                    INSERT INTO order_books (order_id, book_isbn, quantity, unit_price) VALUES (?, ?, ?, ?)
+                    """
+                    cursor.executemany(books_query, [
+                        (order_id, isbn, quantity, prices[isbn]) for isbn, quantity in book_quantities.items()
+                    ])
+
+                    reservations_query = f"""
+                    INSERT INTO stock_reservations (order_id, ISBN, quantity, expires_at)
+                    VALUES (?, ?, ?, strftime('%Y-%m-%d %H:%M:%S', 'now', '+{int(self.reservation_minutes)} minutes'))
+                    """
+                    cursor.executemany(reservations_query, [
+                        (order_id, isbn, quantity) for isbn, quantity in book_quantities.items()
+                    ])
+                return order_id
+
+            # Stock held by expired reservations is available again
+            self.release_expired_reservations()
+            order_id = self._with_busy_retry(write_order)
+            CatalogCache().invalidate(*book_quantities)
             return order_id
         except Error as e:
             print(f"Error placing order: {e}")
-            self.conn.rollback()  # Rollback in case of error
             return None
 
 
+    def fetch_entries_by_keys(self, table, key_column, keys, columns):
+        """
+        Fetch the rows of a table whose key column is in keys.
+        The keys are looked up with chunked IN (...) queries and the
+        result is a dictionary mapping each found key to its row.
+        The first selected column must be the key column.
+        """
+        keys = list(dict.fromkeys(keys))
+        entries = {}
+        try:
+            for start in range(0, len(keys), self.MAX_QUERY_PARAMS):
+                chunk = keys[start:start + self.MAX_QUERY_PARAMS]
+                placeholders = ", ".join("?" * len(chunk))
+                query = f"SELECT {columns} FROM {table} WHERE {key_column} IN ({placeholders})"
+                cursor = self._reader()
+                cursor.execute(query, chunk)
+                for row in cursor.fetchall():
+                    entries[row[0]] = row
+            return entries
+        except Error as e:
+            print(f"Error fetching entries from {table}: {e}")
+            return {}
+
+    def _reservation_chunks(self, order_ids):
+        """Yield (chunk, placeholders) pairs covering order_ids"""
+        order_ids = list(dict.fromkeys(order_ids))
+        for start in range(0, len(order_ids), self.MAX_QUERY_PARAMS):
+            chunk = order_ids[start:start + self.MAX_QUERY_PARAMS]
+            yield tuple(chunk), ", ".join("?" * len(chunk))
+
+    def release_reservations(self, order_ids):
+        """
+        Give the stock reserved by order_ids back to books and drop the
+        reservations (when the orders are cancelled). Runs in a transaction,
+        joining the caller's if there is one.
+        """
+        isbns = set()
+        with self.transaction():
+            cursor = self.conn.cursor()
+            for chunk, placeholders in self._reservation_chunks(order_ids):
+                cursor.execute(f"SELECT DISTINCT ISBN FROM stock_reservations WHERE order_id IN ({placeholders})",
+                               chunk)
+                isbns.update(row.ISBN for row in cursor.fetchall())
+                cursor.execute(f"""
+                UPDATE books
+                SET stock = books.stock + r.quantity
+                FROM (
+                    SELECT ISBN, SUM(quantity) AS quantity
+                    FROM stock_reservations
+                    WHERE order_id IN ({placeholders})
+                    GROUP BY ISBN
+                ) AS r
+                WHERE books.ISBN = r.ISBN
+                """, chunk)
+                cursor.execute(f"DELETE FROM stock_reservations WHERE order_id IN ({placeholders})", chunk)
+        CatalogCache().invalidate(*isbns)
+
+    def convert_reservations(self, order_ids):
+        """
+        Turn the stock reserved by order_ids into sold books (when the orders
+        are confirmed) and drop the reservations. Books no longer held (the
+        hold expired, or the order predates reservations) are taken from
+        stock again with the same conditional update as checkout; an order
+        whose stock is short is left untouched and reported.
+        Runs in a transaction, joining the caller's if there is one.
+        Returns the orders that could not be converted mapped to the reason.
+        """
+        failed = {}
+        isbns = set()
+        with self.transaction():
+            cursor = self.conn.cursor()
+            for order_id in dict.fromkeys(order_ids):
+                cursor.execute("""
+                SELECT ob.book_isbn, b.title, ob.quantity, IFNULL(r.quantity, 0) AS reserved
+                FROM order_books ob
+                LEFT JOIN books b ON b.ISBN = ob.book_isbn
+                LEFT JOIN stock_reservations r ON r.order_id = ob.order_id AND r.ISBN = ob.book_isbn
+                WHERE ob.order_id = ?
+                """, (order_id,))
+                lines = cursor.fetchall()
+                try:
+                    # Each order converts as a whole or not at all
+                    with self.transaction():
+                        for line in lines:
+                            missing = line.quantity - line.reserved
+                            if missing > 0:
+                                cursor.execute("UPDATE books SET stock = stock - ? WHERE ISBN = ? AND stock >= ?",
+                                               (missing, line.book_isbn, missing))
+                                if cursor.rowcount != 1:
+                                    raise ValueError(f"Not enough stock for {line.title or line.book_isbn}")
+                        cursor.executemany("UPDATE books SET sold = COALESCE(sold, 0) + ? WHERE ISBN = ?",
+                                           [(line.quantity, line.book_isbn) for line in lines])
+                        cursor.execute("DELETE FROM stock_reservations WHERE order_id = ?", (order_id,))
+                except ValueError as e:
+                    failed[order_id] = str(e)
+                    continue
+                isbns.update(line.book_isbn for line in lines)
+        CatalogCache().invalidate(*isbns)
+        return failed
+
+    def release_expired_reservations(self):
+        """
+        Give back the stock of reservations whose hold expired. The orders
+        stay pending: their stock is taken again when they are confirmed.
+        Returns the IDs of the orders whose hold lapsed.
+        """
+        query = "SELECT 1 FROM stock_reservations WHERE expires_at <= strftime('%Y-%m-%d %H:%M:%S', 'now') LIMIT 1"
+        # Cheap check first, so the write lock is only taken when needed
+        if not self.fetch_one_entry(query):
+            return []
+
+        isbns = set()
+        with self.transaction():
+            cursor = self.conn.cursor()
+            cutoff = cursor.execute("SELECT strftime('%Y-%m-%d %H:%M:%S', 'now')").fetchone()[0]
+            expired = cursor.execute("SELECT order_id, ISBN FROM stock_reservations WHERE expires_at <= ?",
+                                     (cutoff,)).fetchall()
+            cursor.execute("""
+            UPDATE books
+            SET stock = books.stock + r.quantity
+            FROM (
+                SELECT ISBN, SUM(quantity) AS quantity
+                FROM stock_reservations
+                WHERE expires_at <= ?
+                GROUP BY ISBN
+            ) AS r
+            WHERE books.ISBN = r.ISBN
+            """, (cutoff,))
+            cursor.execute("DELETE FROM stock_reservations WHERE expires_at <= ?", (cutoff,))
+            isbns.update(row.ISBN for row in expired)
+        CatalogCache().invalidate(*isbns)
+        return list(dict.fromkeys(row.order_id for row in expired))
+
+    def fetch_books_by_isbn(self, isbns, columns="ISBN, title, price"):
+        """Fetch several books at once, keyed by ISBN (ISBN must be the first column)."""
+        return self.fetch_entries_by_keys("books", "ISBN", isbns, columns)
+
+    def get_books(self, isbns):
+        """
+        Return full books rows keyed by ISBN, served from the catalog cache.
+        Only the books not cached are read from the database (in one
+        chunked query) and then cached. Writes to books must invalidate
+        them in CatalogCache; writes by other processes are picked up
+        through the books table version.
+        """
+        cache = CatalogCache()
+        if cache.needs_validation():
+            cache.validate(self.get_table_version('books'))
+
+        books = {}
+        missing = []
+        for isbn in dict.fromkeys(str(isbn) for isbn in isbns):
+            row = cache.get(isbn)
+            if row is None:
+                missing.append(isbn)
+            else:
+                books[isbn] = row
+
+        if missing:
+            generation = cache.generation
+            fetched = self.fetch_entries_by_keys("books", "ISBN", missing, "*")
+            # Rows read inside a transaction may still be rolled back
+            if not self.in_transaction():
+                cache.put_many(fetched.values(), generation)
+            books.update(fetched)
+        return books
+
+    def get_book(self, isbn):
+        """Return the full books row for isbn (see get_books), or None"""
+        return self.get_books([isbn]).get(str(isbn))
+
+    def fetch_page(self, table, columns, key_column, sort_column=None, descending=False,
+                   filters=None, after=None, limit=100):
+        """
+        Fetch one page of a table using keyset pagination.
+        Rows are ordered by sort_column (then key_column, which must be
+        unique) and the next page starts after the row passed as after,
+        so deep pages cost the same as the first one.
+        filters maps column names to text that column must contain.
+        Column names are checked against columns, which must include
+        key_column and sort_column.
+        """
+        sort_column = sort_column or key_column
+        filters = {column: text for column, text in (filters or {}).items() if text}
+        for column in [key_column, sort_column, *filters]:
+            if column not in columns:
+                raise ValueError(f"Unknown column: {column}")
+
+        # Rows with a NULL sort value still need a comparable key
+        if sort_column == key_column:
+            order_key = [key_column]
+        else:
+            order_key = [f"IFNULL({sort_column}, '')", key_column]
+        direction = "DESC" if descending else "ASC"
+
+        query = f"SELECT {', '.join(columns)} FROM {table} WHERE 1 = 1"
+        params = []
+        for column, text in filters.items():
+            query += f" AND CAST({column} AS TEXT) LIKE ?"
+            params.append(f"%{text}%")
+
+        if after is not None:
+            after_values = [after[columns.index(key_column)]]
+            if sort_column != key_column:
+                sort_value = after[columns.index(sort_column)]
+                after_values.insert(0, '' if sort_value is None else sort_value)
+            placeholders = ", ".join("?" * len(order_key))
+            query += f" AND ({', '.join(order_key)}) {'<' if descending else '>'} ({placeholders})"
+            params.extend(after_values)
+
+        query += f" ORDER BY {', '.join(f'{part} {direction}' for part in order_key)} LIMIT ?"
+        params.append(limit)
+        return self.fetch_all_entries(query, tuple(params)) or []
+
+    def get_change_marker(self):
+        """
+        Return a cheap marker that changes whenever the database may have changed.
+        PRAGMA data_version (read on the read connection) moves whenever
+        the write connection or another process commits, and total_changes
+        when this instance writes. Compare markers before
+        asking for table versions.
+        """
+        data_version = self.fetch_one_entry("PRAGMA data_version")
+        return (data_version[0] if data_version else None, self.conn.total_changes)
+
+    def get_table_version(self, table):
+        """Return the change counter the triggers keep for table"""
+        result = self.fetch_one_entry("SELECT version FROM table_versions WHERE table_name = ?", (table,))
+        return result[0] if result else 0
+
+    def fetch_changed_rows(self, table, columns, since_version):
+        """
+        Fetch the rows of table changed after since_version.
+        Only tables with a trigger-maintained row_version column (orders)
+        can be queried this way.
+        """
+        query = f"SELECT {', '.join(columns)} FROM {table} WHERE row_version > ?"
+        return self.fetch_all_entries(query, (since_version,)) or []
+
     def get_order(self, order_id):
         """Retrieve an order by ID along with the books in it"""
         try:
             query = """
-            SELECT orders.order_id, orders.customer_id, orders.order_date, orders.status, order_books.book_isbn, order_books.quantity 
+            SELECT orders.order_id, orders.customer_username, orders.created_at, orders.status, order_books.book_isbn, order_books.quantity 
             FROM orders
             INNER JOIN order_books ON orders.order_id = order_books.order_id
             WHERE orders.order_id = ?
             """
-            self.cursor.execute(query, (order_id,))
-            order_details = self.cursor.fetchall()
+            cursor = self._reader()
+            cursor.execute(query, (order_id,))
+            order_details = cursor.fetchall()
             return order_details
         except Error as e:
             print(f"Error retrieving order: {e}")
             return None
     
     def close(self):
-        """Close the database connection"""
-        self.conn.close()
+        """Close every read and write database connection"""
+        self._local = threading.local()
+        self._read_pool.close_all()
+        self._write_pool.close_all()
 
     def top_categories(self):
         # Top catgeories 
         """Retrieve the top 3 sold categories from the database."""
-        query = """
-        SELECT category, SUM(sold) AS total_sold
-        FROM books
-        GROUP BY category
-        ORDER BY total_sold DESC
-        LIMIT 3;
-        """
+        query = self.TOP_CATEGORIES_QUERY
         db_manager=DatabaseManager()
         results = db_manager.fetch_all_entries(query)
         print("Top 3 Sold Categories:")
@@ -253,12 +1132,125 @@ class DatabaseManager:
             print(f"{row[0]:<22} | {row[1]}")
         return results
 
+    @staticmethod
+    def _build_match_query(search_term):
+        """Turn free text into an FTS5 query matching every word as a prefix"""
+        words = search_term.split()
+        return " ".join('"' + word.replace('"', '""') + '"*' for word in words)
+
+    def search_books(self, search_term="", category=None, limit=50, offset=0, after=None):
+        """
+        Search books by title, author, category and review text.
+        Every word of search_term is matched as a prefix and results are
+        ranked by relevance (bm25, weighting title over author over category
+        over reviews). Without a search term books are listed by title.
+
+        Each row holds BOOK_LISTING_COLUMNS followed by its sort rank. Pages
+        can be fetched with limit/offset, or with keyset pagination by
+        passing the last row of the previous page as after, which stays
+        fast however deep the user pages.
+        """
+        match_query = self._build_match_query(search_term or "")
+        columns = ", ".join(f"b.{column.strip()}" for column in self.BOOK_LISTING_COLUMNS.split(","))
+        params = []
+
+        if match_query:
+            sort_rank = "bm25(books_fts, 0.0, 10.0, 5.0, 2.0, 1.0)"
+            query = f"""
+            SELECT {columns}, {sort_rank} AS sort_rank
+            FROM books_fts
+            CROSS JOIN books b ON b.ISBN = books_fts.ISBN  -- keep the FTS lookup as the outer loop
+            WHERE books_fts MATCH ?
+            """
+            params.append(match_query)
+        else:
+            sort_rank = "b.title"
+            query = f"SELECT {columns}, {sort_rank} AS sort_rank FROM books b WHERE 1 = 1"
+
+        if category:
+            # With a search term the unary + keeps the planner joining books
+            # by ISBN instead of scanning the category index for every match
+            query += " AND +b.category = ?" if match_query else " AND b.category = ?"
+            params.append(category)
+
+        if after is not None:
+            query += f" AND ({sort_rank}, b.ISBN) > (?, ?)"
+            params.extend([after[-1], after[0]])
+
+        query += f" ORDER BY {sort_rank}, b.ISBN LIMIT ? OFFSET ?"
+        params.extend([limit, offset])
+
+        try:
+            cursor = self._reader()
+            cursor.execute(query, params)
+            return cursor.fetchall()
+        except Error as e:
+            # Without the search index fall back to a plain substring match
+            print(f"Error searching books: {e}")
+            query = f"""
+            SELECT {self.BOOK_LISTING_COLUMNS}, title AS sort_rank
+            FROM books
+            WHERE (LOWER(title) LIKE ? OR LOWER(author) LIKE ?)
+            """
+            term = f"%{(search_term or '').lower()}%"
+            params = [term, term]
+            if category:
+                query += " AND category = ?"
+                params.append(category)
+            if after is not None:
+                query += " AND (title, ISBN) > (?, ?)"
+                params.extend([after[-1], after[0]])
+            query += " ORDER BY title, ISBN LIMIT ? OFFSET ?"
+            params.extend([limit, offset])
+            return self.fetch_all_entries(query, tuple(params)) or []
+
+    def rebuild_search_index(self):
+        """Repopulate books_fts from scratch (e.g. after a VACUUM renumbers rowids)"""
+        self.execute_transaction([(statement, None) for statement in self.REBUILD_SEARCH_INDEX])
+
+    def top_selling_books_in_period(self, period, limit=3):
+        """
+        Retrieve the best selling books of the current day, week or month.
+        Reads only that period's rollup rows, however long the order history.
+        """
+        query = f"""
+        SELECT r.ISBN, b.title, b.author, r.quantity
+        FROM sales_rollups r
+        JOIN books b ON b.ISBN = r.ISBN
+        WHERE r.period = ? AND r.period_start = {self.PERIOD_STARTS[period]}
+        ORDER BY r.quantity DESC
+        LIMIT ?
+        """
+        return self.fetch_all_entries(query, (period, limit)) or []
+
+    def top_categories_in_period(self, period, limit=3):
+        """Retrieve the best selling categories of the current day, week or month."""
+        query = f"""
+        SELECT NULLIF(category, '') AS category, quantity
+        FROM category_sales_rollups
+        WHERE period = ? AND period_start = {self.PERIOD_STARTS[period]}
+        ORDER BY quantity DESC
+        LIMIT ?
+        """
+        return self.fetch_all_entries(query, (period, limit)) or []
+
+    def get_order_status_history(self, order_id):
+        """Retrieve every status an order went through with the time it changed"""
+        query = """
+        SELECT status, changed_at
+        FROM order_status_history
+        WHERE order_id = ?
+        ORDER BY changed_at, rowid
+        """
+        return self.fetch_all_entries(query, (order_id,)) or []
+
     def get_categories(self):
         """Fetch all unique categories from books table"""
         try:
             query = "SELECT DISTINCT category FROM books ORDER BY category"
-            self.cursor.execute(query)
-            categories = [row[0] for row in self.cursor.fetchall()]
+            cursor = self._reader()
+            cursor.execute(query)
+            categories = [row[0] for row in cursor.fetchall()]
             return categories
         except Error as e:
             print(f"Error fetching categories: {e}")
@@ -266,16 +1258,15 @@ class DatabaseManager:
 
     def get_total_books_sold(self):
         """Get the total number of books sold across all books"""
-        query = "SELECT SUM(sold) FROM books"
+        query = "SELECT total_sold FROM sales_totals WHERE id = 1"
         result = self.fetch_one_entry(query)
-        return result[0] if result[0] is not None else 0
+        return result[0] if result and result[0] is not None else 0
 
     def insert_book_review(self, isbn, review):
         """Insert a review for a book into the book_reviews table"""
         try:
             query = "INSERT INTO book_reviews (ISBN, review) VALUES (?, ?)"
-            self.cursor.execute(query, (isbn, review))
-            self.conn.commit()
+            self.execute_query(query, (isbn, review))
             print(f"Review added successfully for book with ISBN: {isbn}")
             return True
         except Error as e:
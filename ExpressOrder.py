@@ -10,6 +10,6 @@ class ExpressOrder(Order):
 
     def calculate_total(self):
         self.total = (
-            sum(book['price'] for book in self.book_list) + 10  # Additional express fee
+            sum(book['price'] * book.get('quantity', 1) for book in self.book_list) + 10  # Additional express fee
         )
         return self.total
@@ -1,3 +1,4 @@
+import asyncio
 import tkinter as tk
 from tkinter import ttk, messagebox
 from tkinter import filedialog 
@@ -6,7 +7,15 @@ from Main import login, register
 from Customer import Customer
 from Admin import Admin
 from DatabaseManager import DatabaseManager
-from PIL import Image, ImageTk
+from CatalogCache import CatalogCache
+from CatalogImporter import CatalogImporter
+from ThumbnailCache import ThumbnailCache
+from ImageLoader import ImageLoader
+from VirtualBookGrid import VirtualBookGrid
+from PagedTreeview import PagedTreeview
+from AsyncDataAccess import AsyncDataAccess
+from TkAsyncBridge import TkAsyncBridge
+from ActionTimer import ActionTimer
 
 class BookstoreGUI:
     def __init__(self):
@@ -16,6 +25,19 @@ class BookstoreGUI:
         
         # Initialize the database manager
         self.db_manager = DatabaseManager()
+
+        # Shared cache of resized cover images, and the background loader
+        # that fills it without blocking the Tk event loop
+        self.thumbnail_cache = ThumbnailCache()
+        self.image_loader = ImageLoader(self.root)
+
+        # Slow database work runs on worker threads; handlers await it
+        # through an asyncio loop driven from the Tk mainloop
+        self.async_db = AsyncDataAccess()
+        self.async_bridge = TkAsyncBridge(self.root)
+
+        # Latency of user actions, from click to rendered result
+        self.action_timer = ActionTimer()
         
         # Initialize the login frame and current user
         self.current_frame = None
@@ -34,6 +56,13 @@ class BookstoreGUI:
         try:
             # Save categories to file
             self.db_manager.save_categories_to_file(self.categories)
+            self.image_loader.shutdown()
+            self.async_bridge.shutdown()
+            self.async_db.shutdown()
+            # Write the SQL statistics collected while tracing was on
+            if self.db_manager.tracer is not None:
+                self.db_manager.tracer.dump()
+            self.action_timer.export()
         finally:
             # Close the window
             self.root.destroy()
@@ -385,9 +414,7 @@ class BookstoreGUI:
 
         def load_image(filepath):
             try:
-                image = Image.open(filepath)
-                image = image.resize((200, 300), Image.Resampling.LANCZOS)
-                photo = ImageTk.PhotoImage(image)
+                photo = self.thumbnail_cache.get_photo(filepath, (200, 300))
                 preview_label.config(image=photo)
                 preview_label.image = photo
             except Exception as e:
@@ -424,23 +451,19 @@ class BookstoreGUI:
                 db_manager = DatabaseManager()
                 if book_var.get():
                     original_isbn = book_var.get().split(' - ')[0]
-                    query = """
-                    SELECT *
-                    FROM books WHERE ISBN = ?
-                    """
-                    original_book_data = db_manager.fetch_one_entry(query, (original_isbn,))
+                    original_book_data = db_manager.get_book(original_isbn)
                     
                     if original_book_data:
                         # Fetch reviews for the original book
                         review_query = "SELECT review FROM book_reviews WHERE ISBN = ?"
                         reviews = db_manager.fetch_all_entries(review_query, (original_isbn,))
-                        reviews_list = [review[0] for review in reviews]  # Extract reviews from tuples
+                        reviews_list = [review.review for review in reviews]  # Extract reviews from records
 
 
 
 
                         # Create a Book instance from the original data, including reviews
-                        original_book = Book(*original_book_data, reviews=reviews_list)
+                        original_book = Book.from_row(original_book_data, reviews=reviews_list)
                         cloned_book_instance = original_book.clone()  # Clone the book
 
                         # Check if any field (except ISBN) was modified
@@ -483,12 +506,8 @@ class BookstoreGUI:
             
             try:
                 isbn = book_var.get().split(' - ')[0]
-                query = """
-                SELECT ISBN, title, author, price, stock, edition, category, cover_image_path
-                FROM books WHERE ISBN = ?
-                """
                 db_manager = DatabaseManager()
-                book_data = db_manager.fetch_one_entry(query, (isbn,))
+                book_data = db_manager.get_book(isbn)
                 
                 if book_data:
                     # Clear ISBN field (must be unique)
@@ -496,26 +515,26 @@ class BookstoreGUI:
                     
                     # Fill other fields with book data
                     entries['title'].delete(0, tk.END)
-                    entries['title'].insert(0, book_data[1])
+                    entries['title'].insert(0, book_data.title)
                     
                     entries['author'].delete(0, tk.END)
-                    entries['author'].insert(0, book_data[2])
+                    entries['author'].insert(0, book_data.author)
                     
                     entries['price'].delete(0, tk.END)
-                    entries['price'].insert(0, str(book_data[3]))
+                    entries['price'].insert(0, str(book_data.price))
                     
                     entries['stock'].delete(0, tk.END)
-                    entries['stock'].insert(0, str(book_data[4]))
+                    entries['stock'].insert(0, str(book_data.stock))
                     
                     entries['edition'].delete(0, tk.END)
-                    entries['edition'].insert(0, book_data[5])
+                    entries['edition'].insert(0, book_data.edition)
                     
-                    category_var.set(book_data[6])
-                    image_path_var.set(book_data[7])
+                    category_var.set(book_data.category)
+                    image_path_var.set(book_data.cover_image_path)
                     
                     # Update image preview
-                    if book_data[7]:
-                        load_image(book_data[7])
+                    if book_data.cover_image_path:
+                        load_image(book_data.cover_image_path)
                     
             except Exception as e:
                 messagebox.showerror("Error", f"Failed to load book data: {str(e)}")
@@ -530,10 +549,12 @@ class BookstoreGUI:
         orders_window.title("View Orders")
         orders_window.geometry("800x600")
 
-        # Create a treeview to display orders
+        # Create a treeview to display orders (several orders can be selected
+        # and processed at once)
         tree = ttk.Treeview(orders_window, 
                            columns=('Order ID', 'Customer Username', 'Status', 'Shipping Method', 'Total'),
-                           show='headings')
+                           show='headings',
+                           selectmode='extended')
         
         # Set column headings
         for col in ('Order ID', 'Customer Username', 'Status', 'Shipping Method', 'Total'):
@@ -542,30 +563,21 @@ class BookstoreGUI:
 
         # Add scrollbar
         scrollbar = ttk.Scrollbar(orders_window, orient=tk.VERTICAL, command=tree.yview)
-        tree.configure(yscrollcommand=scrollbar.set)
+
+        # Orders are fetched page by page as the user scrolls, newest first;
+        # clicking a heading sorts by that column
+        orders_pager = PagedTreeview(tree, scrollbar, 'orders',
+                                     ('order_id', 'customer_username', 'status', 'shipping_method',
+                                      'total', 'customization', 'gift_note'),
+                                     key_column='order_id', descending=True)
+        orders_pager.create_filter_bar(orders_window).pack(side=tk.TOP, fill=tk.X, pady=5)
         
         # Pack the treeview and scrollbar
         tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
         scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
 
         def refresh_orders():
-            # Clear existing items
-            for item in tree.get_children():
-                tree.delete(item)
-                
-            # Get orders from database
-            db_manager = DatabaseManager()
-            query = """
-            SELECT order_id, customer_username, status, shipping_method, total, customization, gift_note
-            FROM orders
-            ORDER BY order_id DESC
-            """
-            orders = db_manager.fetch_all_entries(query)
-            
-            # Insert orders into treeview
-            if orders:
-                for order in orders:
-                    tree.insert('', tk.END, values=order)
+            orders_pager.refresh()
         # Create frame for buttons
         button_frame = tk.Frame(orders_window)
         button_frame.pack(pady=10)
@@ -579,12 +591,16 @@ class BookstoreGUI:
         tk.Button(button_frame, text="Ship Order", 
                  command=lambda: self.ship_selected_order(tree, refresh_orders)).pack(side=tk.LEFT, padx=5)
         tk.Button(button_frame, text="Cancel Order", 
-                 command=lambda: self.cancel_selected_order(tree, refresh_orders)).pack(side=tk.LEFT, padx=5)
+                 command=lambda: self.transition_selected_orders(tree, refresh_orders, "cancelled")).pack(side=tk.LEFT, padx=5)
 
-        # Initial load
+        # Initial load, then keep the view current by polling for changed orders
         refresh_orders()
+        orders_pager.start_auto_refresh()
 
+    @ActionTimer.timed('Open Statistics', finish=False)
     def manage_categories(self):
+        span = ActionTimer.current()
+
         # Create a new window for statistics
         stats_window = tk.Toplevel(self.root)
         stats_window.title("Sales Statistics")
@@ -601,6 +617,19 @@ class BookstoreGUI:
         notebook.add(top_selling_frame, text='Top Selling')
         notebook.add(popular_categories_frame, text='Popular Categories')
         notebook.add(stock_levels_frame, text='Stock Levels')
+
+        # Period selector for the sales views
+        periods = {'All Time': None, 'Today': 'day', 'This Week': 'week', 'This Month': 'month'}
+        period_frame = tk.Frame(stats_window)
+        period_frame.pack(fill='x', padx=10, pady=5)
+        tk.Label(period_frame, text="Period:").pack(side=tk.LEFT, padx=5)
+        period_var = tk.StringVar(value='All Time')
+        period_combo = ttk.Combobox(period_frame, textvariable=period_var,
+                                    values=list(periods), state='readonly', width=15)
+        period_combo.pack(side=tk.LEFT, padx=5)
+        period_combo.bind('<<ComboboxSelected>>',
+                          lambda e: (show_top_selling(), show_popular_categories()))
+
         notebook.pack(expand=True, fill='both')
 
         # Top Selling Books
@@ -619,12 +648,19 @@ class BookstoreGUI:
                 tree.heading(col, text=col)
                 tree.column(col, width=150)
 
-            # Get top selling books from admin
-            top_books = self.current_user.top_selling_books()
-            
-            # Insert data into treeview
-            for book in top_books:
-                tree.insert('', tk.END, values=book)
+            # Get top selling books from admin without blocking the window
+            async def load_top_books():
+                top_books = await self.async_db.top_selling_books(self.current_user,
+                                                                  periods[period_var.get()])
+                if not tree.winfo_exists():
+                    return
+
+                # Insert data into treeview
+                with self.action_timer.phase('widgets'):
+                    for book in top_books:
+                        tree.insert('', tk.END, values=book)
+
+            task = self.async_bridge.spawn(load_top_books())
             
             # Add scrollbar
             scrollbar = ttk.Scrollbar(top_selling_frame, orient=tk.VERTICAL, command=tree.yview)
@@ -637,52 +673,60 @@ class BookstoreGUI:
             # Add refresh button
             tk.Button(top_selling_frame, text="Refresh", 
                      command=show_top_selling).pack(pady=10)
+            return task
 
         # Initial load of top selling books
-        show_top_selling()
+        top_selling_task = show_top_selling()
 
         def show_popular_categories():
-            # Clear previous content
-            for widget in popular_categories_frame.winfo_children():
-                widget.destroy()
-            
-            # Create treeview for popular categories
-            tree = ttk.Treeview(popular_categories_frame, 
-                               columns=('Category', 'Total Sold'),
-                               show='headings')
-            
-            # Set column headings
-            for col in ('Category', 'Total Sold'):
-                tree.heading(col, text=col)
-                tree.column(col, width=200)
+            # Get popular categories from admin without blocking the window
+            async def load_popular_categories():
+                popular_categories = await self.async_db.top_categories(self.current_user,
+                                                                        periods[period_var.get()])
+                if not popular_categories_frame.winfo_exists():
+                    return
 
-            # Get popular categories from admin
-            popular_categories = self.current_user.top_categories()
-            
-            if not popular_categories:
-                # Show message if no data
-                tk.Label(popular_categories_frame, 
-                        text="No category data available", 
-                        font=('Arial', 12)).pack(pady=20)
-            else:
-                # Insert data into treeview
-                for category in popular_categories:
-                    tree.insert('', tk.END, values=category)
-                    
-                # Add scrollbar
-                scrollbar = ttk.Scrollbar(popular_categories_frame, orient=tk.VERTICAL, command=tree.yview)
-                tree.configure(yscrollcommand=scrollbar.set)
-                
-                # Pack the treeview and scrollbar
-                tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
-                scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
-            
-            # Add refresh button
-            tk.Button(popular_categories_frame, text="Refresh", 
-                     command=show_popular_categories).pack(pady=10)
+                # Clear previous content
+                for widget in popular_categories_frame.winfo_children():
+                    widget.destroy()
+
+                # Create treeview for popular categories
+                tree = ttk.Treeview(popular_categories_frame,
+                                   columns=('Category', 'Total Sold'),
+                                   show='headings')
+
+                # Set column headings
+                for col in ('Category', 'Total Sold'):
+                    tree.heading(col, text=col)
+                    tree.column(col, width=200)
+
+                if not popular_categories:
+                    # Show message if no data
+                    tk.Label(popular_categories_frame,
+                            text="No category data available",
+                            font=('Arial', 12)).pack(pady=20)
+                else:
+                    # Insert data into treeview
+                    with self.action_timer.phase('widgets'):
+                        for category in popular_categories:
+                            tree.insert('', tk.END, values=category)
+
+                    # Add scrollbar
+                    scrollbar = ttk.Scrollbar(popular_categories_frame, orient=tk.VERTICAL, command=tree.yview)
+                    tree.configure(yscrollcommand=scrollbar.set)
+
+                    # Pack the treeview and scrollbar
+                    tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+                    scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+
+                # Add refresh button
+                tk.Button(popular_categories_frame, text="Refresh",
+                         command=show_popular_categories).pack(pady=10)
+
+            return self.async_bridge.spawn(load_popular_categories())
 
         # Initial load of popular categories
-        show_popular_categories()
+        popular_categories_task = show_popular_categories()
 
         def show_stock_levels():
             # Clear previous content
@@ -699,18 +743,20 @@ class BookstoreGUI:
                 tree.heading(col, text=col)
                 tree.column(col, width=200)
 
-            # Get stock levels from admin
-            stock_levels = self.current_user.stock_level()
+            # Stream stock levels from admin
+            stock_levels = self.current_user.iter_stock_levels()
+            with self.action_timer.phase('sql'):
+                first_book = next(stock_levels, None)
             
-            if not stock_levels:
+            if first_book is None:
                 # Show message if no data
                 tk.Label(stock_levels_frame, 
                         text="No books in inventory", 
                         font=('Arial', 12)).pack(pady=20)
             else:
-                # Insert data into treeview
-                for book in stock_levels:
-                    tree.insert('', tk.END, values=book)
+                # Insert data into treeview a batch at a time
+                tree.insert('', tk.END, values=first_book)
+                self.stream_into_tree(tree, stock_levels)
                     
                 # Add scrollbar
                 scrollbar = ttk.Scrollbar(stock_levels_frame, orient=tk.VERTICAL, command=tree.yview)
@@ -727,6 +773,17 @@ class BookstoreGUI:
         # Initial load of stock levels
         show_stock_levels()
 
+        # The window is ready once both sales views have loaded
+        async def finish_when_loaded():
+            await asyncio.gather(top_selling_task, popular_categories_task, return_exceptions=True)
+            if stats_window.winfo_exists():
+                span.finish(stats_window)
+            else:
+                span.cancel()
+
+        self.async_bridge.spawn(finish_when_loaded())
+
+    @ActionTimer.timed('Open Browse Books', finish=False)
     def browse_books(self):
         books_window = tk.Toplevel(self.root)
         books_window.title("Browse Books")
@@ -743,7 +800,8 @@ class BookstoreGUI:
         # Create category filter
         category_var = tk.StringVar(value="All Categories")
         db_manager = DatabaseManager()
-        categories = ["All Categories"] + db_manager.get_categories()
+        with self.action_timer.phase('sql'):
+            categories = ["All Categories"] + db_manager.get_categories()
         category_filter = ttk.Combobox(search_frame, 
                                      textvariable=category_var, 
                                      values=categories, 
@@ -751,25 +809,16 @@ class BookstoreGUI:
                                      width=20)
         category_filter.pack(side=tk.LEFT, padx=5)
 
-        # Create scrollable frame
-        main_frame = tk.Frame(books_window)
-        main_frame.pack(fill=tk.BOTH, expand=True)
-
-        canvas = tk.Canvas(main_frame)
-        scrollbar = ttk.Scrollbar(main_frame, orient=tk.VERTICAL, command=canvas.yview)
-        grid_frame = tk.Frame(canvas)
-
-        grid_frame.bind(
-            "<Configure>",
-            lambda e: canvas.configure(scrollregion=canvas.bbox("all"))
-        )
-
-        canvas.create_window((0, 0), window=grid_frame, anchor="nw")
-        canvas.configure(yscrollcommand=scrollbar.set)
+        # Create the book grid; it only builds widgets for the rows in view
+        # and fetches books page by page as the user scrolls
+        book_grid = VirtualBookGrid(books_window, self.image_loader,
+                                    on_details=lambda book: show_book_details(book),
+                                    on_add_to_cart=lambda isbn: self.add_to_cart(isbn, books_window))
+        book_grid.pack(fill=tk.BOTH, expand=True)
 
         def show_book_details(book_data):
             details_window = tk.Toplevel(books_window)
-            details_window.title(f"Book Details - {book_data[1]}")
+            details_window.title(f"Book Details - {book_data.title}")
             details_window.geometry("600x800")
 
             # Create main container
@@ -787,11 +836,9 @@ class BookstoreGUI:
             reviews_frame.pack(pady=10, fill='both', expand=True)
 
             # Display image
-            if book_data[7]:  # cover_image_path
+            if book_data.cover_image_path:
                 try:
-                    image = Image.open(book_data[7])
-                    image = image.resize((200, 300), Image.Resampling.LANCZOS)
-                    photo = ImageTk.PhotoImage(image)
+                    photo = self.thumbnail_cache.get_photo(book_data.cover_image_path, (200, 300))
                     img_label = tk.Label(image_frame, image=photo)
                     img_label.image = photo
                     img_label.pack()
@@ -800,13 +847,13 @@ class BookstoreGUI:
 
             # Book details with better formatting
             details = [
-                ("Title", book_data[1]),
-                ("Author", book_data[2]),
-                ("ISBN", book_data[0]),
-                ("Price", f"${book_data[3]:.2f}"),
-                ("Stock", book_data[4]),
-                ("Edition", book_data[5]),
-                ("Category", book_data[6])
+                ("Title", book_data.title),
+                ("Author", book_data.author),
+                ("ISBN", book_data.ISBN),
+                ("Price", f"${book_data.price:.2f}"),
+                ("Stock", book_data.stock),
+                ("Edition", book_data.edition),
+                ("Category", book_data.category)
             ]
 
             for label, value in details:
@@ -833,7 +880,7 @@ class BookstoreGUI:
             # Get reviews from database
             db_manager = DatabaseManager()
             query = "SELECT review FROM book_reviews WHERE ISBN = ?"
-            reviews = db_manager.fetch_all_entries(query, (book_data[0],))
+            reviews = db_manager.fetch_all_entries(query, (book_data.ISBN,))
 
             if not reviews:
                 # Show "No reviews" message
@@ -871,9 +918,9 @@ class BookstoreGUI:
             button_frame = tk.Frame(main_container)
             button_frame.pack(pady=10)
             
-            if book_data[4] > 0:  # if stock available
+            if book_data.stock > 0:  # if stock available
                 tk.Button(button_frame, text="Add to Cart", 
-                         command=lambda: self.add_to_cart(book_data[0], details_window)).pack()
+                         command=lambda: self.add_to_cart(book_data.ISBN, details_window)).pack()
             else:
                 tk.Label(button_frame, text="Out of Stock", fg="red").pack()
 
@@ -884,93 +931,46 @@ class BookstoreGUI:
             
             details_window.protocol("WM_DELETE_WINDOW", on_closing)
 
+        search_state = {'task': None}
+
         def search_books():
-            # Clear existing books
-            for widget in grid_frame.winfo_children():
-                widget.destroy()
+            with self.action_timer.action('Search', finish=False) as span:
+                start_search(span)
 
-            search_term = search_var.get().lower()
+        def start_search(span):
+            search_term = search_var.get()
             selected_category = category_var.get()
-
-            query = """
-            SELECT ISBN, title, author, price, stock, edition, category, cover_image_path, sold
-            FROM books
-            WHERE (LOWER(title) LIKE ? OR LOWER(author) LIKE ?)
-            """
-            params = [f"%{search_term}%", f"%{search_term}%"]
-
-            if selected_category != "All Categories":
-                query += " AND category = ?"
-                params.append(selected_category)
-
-            books = db_manager.fetch_all_entries(query, tuple(params))
-            display_books(books)
-
-        def display_books(books):
-            # Clear existing books first
-            for widget in grid_frame.winfo_children():
-                widget.destroy()
-
-            for i, book in enumerate(books):
-                row = i // 4
-                col = i % 4
-                
-                # Create frame for each book
-                book_frame = tk.Frame(grid_frame, relief=tk.RAISED, borderwidth=1)
-                book_frame.grid(row=row, column=col, padx=10, pady=10, sticky="nsew")
-                
-                # Image display
-                image_frame = tk.Frame(book_frame, height=200)
-                image_frame.pack(fill=tk.X, pady=5)
-                
-                if book[7]:  # If there's an image path
-                    try:
-                        image = Image.open(book[7])
-                        image = image.resize((150, 200), Image.Resampling.LANCZOS)
-                        photo = ImageTk.PhotoImage(image)
-                        img_label = tk.Label(image_frame, image=photo)
-                        img_label.image = photo
-                        img_label.pack()
-                    except Exception:
-                        tk.Label(image_frame, text="No Image Available").pack()
-
-                # Title only
-                tk.Label(book_frame, text=book[1], wraplength=150, 
-                        font=('Arial', 10, 'bold')).pack(pady=5)
-
-                # Buttons frame
-                buttons_frame = tk.Frame(book_frame)
-                buttons_frame.pack(pady=5)
-
-                # Details button
-                tk.Button(buttons_frame, text="Details", 
-                         command=lambda b=book: show_book_details(b)).pack(side=tk.LEFT, padx=2)
-
-                # Add to Cart button
-                if book[4] > 0:  # If stock available
-                    tk.Button(buttons_frame, text="Add to Cart", 
-                             command=lambda isbn=book[0]: self.add_to_cart(isbn, books_window)).pack(side=tk.LEFT, padx=2)
+            category = None if selected_category == "All Categories" else selected_category
+
+            # Each page continues after the last book of the previous one
+            def fetch_page(last_book, limit):
+                return db_manager.search_books(search_term, category, limit=limit, after=last_book)
+
+            # The first page is fetched in the background; a newer search
+            # cancels an older one that has not finished yet
+            async def load_first_page():
+                first_page = await self.async_db.search_books(search_term, category,
+                                                              limit=book_grid.PAGE_SIZE)
+                if book_grid.winfo_exists():
+                    book_grid.set_source(fetch_page, first_page)
+                    span.finish(book_grid)
                 else:
-                    tk.Label(buttons_frame, text="Out of Stock", fg="red").pack(side=tk.LEFT, padx=2)
-
-        # Configure grid columns to be equal width
-        for i in range(4):
-            grid_frame.grid_columnconfigure(i, weight=1)
+                    span.cancel()
 
-        canvas.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
-        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+            if search_state['task'] is not None:
+                search_state['task'].cancel()
+            search_state['task'] = self.async_bridge.spawn(load_first_page())
+            # A search replaced by a newer one (or one that failed) is not timed
+            search_state['task'].add_done_callback(
+                lambda task: span.cancel() if task.cancelled() or task.exception() else None)
 
         # Add search button and bind Enter key
         tk.Button(search_frame, text="Search", command=search_books).pack(side=tk.LEFT, padx=5)
         search_entry.bind('<Return>', lambda e: search_books())
         category_filter.bind('<<ComboboxSelected>>', lambda e: search_books())
 
-        # Get initial books list
-        query = "SELECT ISBN, title, author, price, stock, edition, category, cover_image_path, sold FROM books"
-        books = db_manager.fetch_all_entries(query)
-        
-        # Initial display of all books
-        display_books(books)
+        # Initial display of the first page of books
+        start_search(ActionTimer.current())
 
     def view_cart(self):
         cart_window = tk.Toplevel(self.root)
@@ -992,10 +992,10 @@ class BookstoreGUI:
 
             total = 0
             db_manager = DatabaseManager()
+            books = db_manager.get_books(self.current_user.cart.keys())
             
             for isbn, quantity in self.current_user.cart.items():
-                query = "SELECT title, price FROM books WHERE ISBN = ?"
-                book_data = db_manager.fetch_one_entry(query, (isbn,))
+                book_data = books.get(isbn)
                 
                 if book_data:
                     item_frame = tk.Frame(cart_frame)
@@ -1004,7 +1004,7 @@ class BookstoreGUI:
                     # Book details
                     details_frame = tk.Frame(item_frame)
                     details_frame.pack(side=tk.LEFT)
-                    tk.Label(details_frame, text=f"{book_data[0]} - ${book_data[1]}").pack(side=tk.LEFT)
+                    tk.Label(details_frame, text=f"{book_data.title} - ${book_data.price}").pack(side=tk.LEFT)
                     
                     # Quantity control frame
                     qty_frame = tk.Frame(item_frame)
@@ -1025,7 +1025,7 @@ class BookstoreGUI:
                     tk.Button(item_frame, text="Remove", 
                              command=lambda i=isbn: remove_from_cart(i)).pack(side=tk.RIGHT)
                     
-                    total += book_data[1] * quantity
+                    total += book_data.price * quantity
 
             tk.Label(cart_frame, text=f"Total: ${total:.2f}", 
                     font=('Arial', 12, 'bold')).pack(pady=10)
@@ -1061,15 +1061,20 @@ class BookstoreGUI:
             tk.Entry(order_window, textvariable=customization_var).pack()
 
       
-            def confirm_order():
+            async def submit_order():
+                span = ActionTimer.current()
+                # Disable the button so a slow checkout is not submitted twice
+                confirm_button.config(state=tk.DISABLED)
                 try:
-                    order_details = self.current_user.place_order(
+                    order_details = await self.async_db.place_order(
+                        self.current_user,
                         shipping_var.get(),
                         gift_note_var.get() if gift_note_var.get() else None,
                         customization_var.get() if customization_var.get() else None,
                     )
                     
                     if order_details:
+                        span.finish()
                         messagebox.showinfo("Success", 
                             f"Order placed successfully!\n"
                             f"Order ID: {order_details['order_id']}\n"
@@ -1082,8 +1087,17 @@ class BookstoreGUI:
                         
                 except Exception as e:
                     messagebox.showerror("Error", f"Failed to place order: {str(e)}")
+                finally:
+                    span.cancel()  # Only successful orders are timed
+                    if confirm_button.winfo_exists():
+                        confirm_button.config(state=tk.NORMAL)
+
+            def confirm_order():
+                with self.action_timer.action('Place Order', finish=False):
+                    self.async_bridge.spawn(submit_order())
         # Add confirm button
-            tk.Button(order_window, text="Confirm Order", command=confirm_order).pack(pady=20)
+            confirm_button = tk.Button(order_window, text="Confirm Order", command=confirm_order)
+            confirm_button.pack(pady=20)
 
 
         def remove_from_cart(isbn):
@@ -1136,23 +1150,28 @@ class BookstoreGUI:
         scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
 
         def refresh_orders():
-            # Clear existing items
-            for item in tree.get_children():
-                tree.delete(item)
-                
-            # Get orders from database
-            db_manager = DatabaseManager()
+            # Get orders from database without blocking the window
             query = """
             SELECT order_id, status, shipping_method, total 
             FROM orders 
             WHERE customer_username = ?
             ORDER BY order_id DESC
             """
-            orders = db_manager.fetch_all_entries(query, (self.current_user.username,))
-            
-            # Insert orders into treeview
-            for order in orders:
-                tree.insert('', tk.END, values=order)
+
+            async def load_orders():
+                orders = await self.async_db.fetch_all_entries(query, (self.current_user.username,))
+                if not tree.winfo_exists():
+                    return
+
+                # Clear existing items
+                for item in tree.get_children():
+                    tree.delete(item)
+
+                # Insert orders into treeview
+                for order in orders or []:
+                    tree.insert('', tk.END, values=order)
+
+            self.async_bridge.spawn(load_orders())
         
 
         def view_order_details():
@@ -1259,28 +1278,18 @@ class BookstoreGUI:
                 new_address = address_entry.get()
                 new_phone = phone_entry.get()
 
-                # Track if any updates were made
-                updates_made = False
-
-                # Update username if changed
-                if new_username and new_username != self.current_user.username:
-                    self.current_user.update_username(new_username)
-                    updates_made = True
-
-                # Update password if provided
-                if new_password:
-                    self.current_user.update_password(new_password)
-                    updates_made = True
+                # Only pass on the values that actually changed
+                changes = {
+                    'username': new_username if new_username != self.current_user.username else None,
+                    'password': new_password,
+                    'address': new_address if new_address != self.current_user.address else None,
+                    'phone': new_phone if new_phone != self.current_user.phone else None
+                }
+                updates_made = any(changes.values())
 
-                # Update address if changed
-                if new_address and new_address != self.current_user.address:
-                    self.current_user.update_address(new_address)
-                    updates_made = True
-
-                # Update phone if changed
-                if new_phone and new_phone != self.current_user.phone:
-                    self.current_user.update_phone(new_phone)
-                    updates_made = True
+                # Apply all changes in a single transaction
+                if updates_made:
+                    self.current_user.update_profile(**changes)
 
                 if updates_made:
                     messagebox.showinfo("Success", "Profile updated successfully!")
@@ -1343,28 +1352,38 @@ class BookstoreGUI:
         tk.Button(buttons_frame, text="Update Phone", command=update_phone).pack(pady=5)
 
     def confirm_selected_order(self, tree, refresh_callback):
-        selected_item = tree.selection()
-        if not selected_item:
-            messagebox.showwarning("Warning", "Please select an order to confirm")
+        self.transition_selected_orders(tree, refresh_callback, "confirmed")
+
+    def transition_selected_orders(self, tree, refresh_callback, target_status):
+        """Move every selected order in the admin orders view to target_status"""
+        action = {'confirmed': 'confirm', 'shipped': 'ship', 'cancelled': 'cancel'}[target_status]
+        selected_items = tree.selection()
+        if not selected_items:
+            messagebox.showwarning("Warning", f"Please select an order to {action}")
             return
-        
+
+        span = self.action_timer.start(f"{action.capitalize()} Order")
         try:
-            order_data = tree.item(selected_item[0])['values']
-            order_id = order_data[0]  # First column is Order ID
-            status = order_data[2]    # Third column is Status
-            
-            # Check if order is pending
-            if status.lower() != 'pending':
-                messagebox.showerror("Error", "Only pending orders can be confirmed")
-                return
-            
-            self.current_user.confirm_order(order_id)
-            messagebox.showinfo("Success", f"Order #{order_id} has been confirmed")
-            
-                        
+            order_ids = [tree.item(item)['values'][0] for item in selected_items]  # First column is Order ID
+            with self.action_timer.phase('sql', span):
+                result = self.current_user.bulk_transition(order_ids, target_status)
+            span.finish()
+
+            if result['failed']:
+                failures = "\n".join(f"Order #{order_id}: {reason}"
+                                     for order_id, reason in result['failed'].items())
+                messagebox.showerror("Error",
+                    f"{len(result['succeeded'])} order(s) {target_status}, "
+                    f"{len(result['failed'])} failed:\n{failures}")
+            elif len(result['succeeded']) == 1:
+                messagebox.showinfo("Success", f"Order #{result['succeeded'][0]} has been {target_status}")
+            else:
+                messagebox.showinfo("Success", f"{len(result['succeeded'])} orders have been {target_status}")
+
             refresh_callback()
         except Exception as e:
-            messagebox.showerror("Error", f"Failed to confirm order: {str(e)}")
+            span.cancel()
+            messagebox.showerror("Error", f"Failed to {action} orders: {str(e)}")
 
     def cancel_selected_order(self, tree, refresh_callback):
         selected_item = tree.selection()
@@ -1405,22 +1424,20 @@ class BookstoreGUI:
 
         # Add scrollbar
         scrollbar = ttk.Scrollbar(books_window, orient=tk.VERTICAL, command=tree.yview)
-        tree.configure(yscrollcommand=scrollbar.set)
+
+        # Books are fetched page by page as the user scrolls; clicking a
+        # heading sorts by that column
+        books_pager = PagedTreeview(tree, scrollbar, 'books',
+                                    ('ISBN', 'title', 'author', 'price', 'stock', 'edition', 'category'),
+                                    key_column='ISBN')
+        books_pager.create_filter_bar(books_window).pack(side=tk.TOP, fill=tk.X, pady=5)
         
         # Pack the treeview and scrollbar
         tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
         scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
 
         def refresh_books():
-            for item in tree.get_children():
-                tree.delete(item)
-                
-            db_manager = DatabaseManager()
-            query = "SELECT ISBN, title, author, price, stock, edition, category FROM books"
-            books = db_manager.fetch_all_entries(query)
-            
-            for book in books:
-                tree.insert('', tk.END, values=book)
+            books_pager.refresh()
 
         def edit_book():
             selected_item = tree.selection()
@@ -1432,9 +1449,8 @@ class BookstoreGUI:
             
             # Get the current image path from database
             db_manager = DatabaseManager()
-            query = "SELECT cover_image_path FROM books WHERE ISBN = ?"
-            result = db_manager.fetch_one_entry(query, (book_data[0],))
-            current_image_path = result[0] if result else None
+            result = db_manager.get_book(book_data[0])
+            current_image_path = result.cover_image_path if result else None
 
             edit_window = tk.Toplevel(books_window)
             edit_window.title("Edit Book")
@@ -1491,20 +1507,9 @@ class BookstoreGUI:
             def load_image(filepath):
                 if filepath:
                     try:
-                        image = Image.open(filepath)
-                        preview_width = right_frame.winfo_width()
-                        preview_height = right_frame.winfo_height()
-                        aspect_ratio = image.width / image.height
-                        
-                        if aspect_ratio > preview_width/preview_height:
-                            new_width = preview_width
-                            new_height = int(preview_width / aspect_ratio)
-                        else:
-                            new_height = preview_height
-                            new_width = int(preview_height * aspect_ratio)
-                        
-                        image = image.resize((new_width, new_height), Image.Resampling.LANCZOS)
-                        photo = ImageTk.PhotoImage(image)
+                        # Fit the image inside the preview area, keeping its aspect ratio
+                        preview_size = (right_frame.winfo_width(), right_frame.winfo_height())
+                        photo = self.thumbnail_cache.get_photo(filepath, preview_size, fit=True)
                         preview_label.config(image=photo)
                         preview_label.image = photo
                     except Exception as e:
@@ -1545,6 +1550,7 @@ class BookstoreGUI:
                     """
                     db_manager = DatabaseManager()
                     db_manager.execute_query(query, (title, author, price, stock, edition, category, cover_image, isbn))
+                    CatalogCache().invalidate(isbn)
                     
                     messagebox.showinfo("Success", "Book updated successfully!")
                     edit_window.destroy()
@@ -1574,6 +1580,32 @@ class BookstoreGUI:
                 except Exception as e:
                     messagebox.showerror("Error", f"Failed to delete book: {str(e)}")
 
+        def import_catalog():
+            path = filedialog.askopenfilename(
+                title="Import Catalog",
+                filetypes=[("Catalog feeds", "*.csv *.jsonl *.ndjson"), ("All files", "*.*")]
+            )
+            if not path:
+                return
+
+            # Stream the feed into the database on a worker thread
+            async def run_import():
+                try:
+                    report = await self.async_db.run(CatalogImporter().import_file, path)
+                except Exception as e:
+                    messagebox.showerror("Error", f"Failed to import catalog: {str(e)}")
+                    return
+                message = (f"Imported {report['imported']} books "
+                           f"({report['rows_per_second']:.0f} books/s)\n"
+                           f"Rejected {report['rejected']} rows")
+                for line_number, reason in report['rejections'][:10]:
+                    message += f"\nLine {line_number}: {reason}"
+                messagebox.showinfo("Import Catalog", message)
+                if tree.winfo_exists():
+                    refresh_books()
+
+            self.async_bridge.spawn(run_import())
+
         # Add buttons
         button_frame = tk.Frame(books_window)
         button_frame.pack(pady=10)
@@ -1582,6 +1614,7 @@ class BookstoreGUI:
         tk.Button(button_frame, text="Edit Book", command=edit_book).pack(side=tk.LEFT, padx=5)
         tk.Button(button_frame, text="Delete Book", command=delete_book).pack(side=tk.LEFT, padx=5)
         tk.Button(button_frame, text="Add New Book", command=self.show_add_book_form).pack(side=tk.LEFT, padx=5)
+        tk.Button(button_frame, text="Import Catalog...", command=import_catalog).pack(side=tk.LEFT, padx=5)
 
         # Initial load
         refresh_books()
@@ -1637,6 +1670,7 @@ class BookstoreGUI:
                     db_manager = DatabaseManager()
                     query = "UPDATE books SET category = ? WHERE category = ?"
                     db_manager.execute_query(query, (new_name, old_name))
+                    CatalogCache().invalidate_all()
                     
                     messagebox.showinfo("Success", "Category updated successfully!")
                     edit_window.destroy()
@@ -1663,6 +1697,7 @@ class BookstoreGUI:
                     db_manager = DatabaseManager()
                     query = "UPDATE books SET category = NULL WHERE category = ?"
                     db_manager.execute_query(query, (category_name,))
+                    CatalogCache().invalidate_all()
                     
                     messagebox.showinfo("Success", "Category deleted successfully!")
                     refresh_categories()
@@ -1713,26 +1748,7 @@ class BookstoreGUI:
         refresh_categories()
 
     def ship_selected_order(self, tree, refresh_callback):
-        selected_item = tree.selection()
-        if not selected_item:
-            messagebox.showwarning("Warning", "Please select an order to ship")
-            return
-        
-        try:
-            order_data = tree.item(selected_item[0])['values']
-            order_id = order_data[0]  # First column is Order ID
-            status = order_data[2]    # Third column is Status
-            
-            # Check if order is confirmed
-            if status.lower() != 'confirmed':
-                messagebox.showerror("Error", "Only confirmed orders can be shipped")
-                return
-            
-            self.current_user.ship_order(order_id)
-            messagebox.showinfo("Success", f"Order #{order_id} has been shipped")
-            refresh_callback()
-        except Exception as e:
-            messagebox.showerror("Error", f"Failed to ship order: {str(e)}")
+        self.transition_selected_orders(tree, refresh_callback, "shipped")
 
     def view_purchased_books(self):
         purchased_window = tk.Toplevel(self.root)
@@ -1776,11 +1792,10 @@ class BookstoreGUI:
             WHERE o.customer_username = ? 
             AND o.status = 'shipped'
             """
-            books = db_manager.fetch_all_entries(query, (self.current_user.username,))
+            books = db_manager.iter_entries(query, (self.current_user.username,))
             
-            # Insert books into treeview
-            for book in books:
-                tree.insert('', tk.END, values=book)
+            # Insert books into treeview a batch at a time
+            self.stream_into_tree(tree, books)
 
         def add_review():
             selected_item = tree.selection()
@@ -1906,6 +1921,31 @@ class BookstoreGUI:
         for book in books:
             books_tree.insert('', tk.END, values=book)
 
+    STREAM_BATCH_SIZE = 200  # Rows inserted into a Treeview per event loop turn
+
+    def stream_into_tree(self, tree, rows, batch_size=STREAM_BATCH_SIZE):
+        """
+        Insert rows (e.g. from DatabaseManager.iter_entries) into tree a
+        batch per event loop turn, so long results neither freeze the
+        window nor get loaded into memory at once. The rows stop being
+        read (and their cursor is closed) if the tree goes away or a newer
+        stream into the same tree replaces them.
+        """
+        tree.stream = rows
+
+        def insert_batch():
+            if not tree.winfo_exists() or tree.stream is not rows:
+                rows.close()
+                return
+            for _ in range(batch_size):
+                row = next(rows, None)
+                if row is None:
+                    return
+                tree.insert('', tk.END, values=row)
+            tree.after_idle(insert_batch)
+
+        insert_batch()
+
     def run(self):
         self.root.mainloop()
 
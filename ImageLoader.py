@@ -0,0 +1,119 @@
+import queue
+from concurrent.futures import ThreadPoolExecutor
+from ActionTimer import ActionTimer
+from ThumbnailCache import ThumbnailCache
+
+class LoadToken:
+    """Groups the loads of one caller (e.g. one grid) so they can be cancelled together"""
+
+    def __init__(self):
+        self.generation = 0  # Bumped by ImageLoader.cancel to discard this caller's stale loads
+        self.futures = set()
+
+
+class ImageLoader:
+    POLL_INTERVAL_MS = 30  # How often finished images are handed to Tk
+
+    def __init__(self, root, max_workers=4):
+        """
+        Decode and resize cover images on worker threads.
+        Finished images are queued and picked up on the Tk thread by a
+        root.after poll, since Tk widgets may only be touched from there.
+        """
+        self.root = root
+        self.cache = ThumbnailCache()
+        self.action_timer = ActionTimer()
+        self._executor = ThreadPoolExecutor(max_workers=max_workers,
+                                            thread_name_prefix='image-loader')
+        self._results = queue.Queue()
+        self._futures = set()
+        self._generation = 0  # Bumped by cancel_all to discard stale loads
+        self._default_token = LoadToken()  # For callers that never cancel on their own
+        self._polling = False
+
+    def new_token(self):
+        """Return a token to pass to load() so cancel(token) only drops that caller's loads"""
+        return LoadToken()
+
+    def load(self, path, size, callback, fit=False, token=None):
+        """
+        Load path resized to size and call callback(photo) on the Tk thread.
+        callback receives None if the image could not be loaded. Images
+        already in memory are delivered immediately.
+        Decoding is charged as 'image' to the action that asked for it.
+        """
+        photo = self.cache.get_cached_photo(path, size, fit)
+        if photo is not None:
+            callback(photo)
+            return
+
+        token = token or self._default_token
+        generation = (self._generation, token, token.generation)
+        future = self._executor.submit(self._decode, generation, path, size, fit, callback,
+                                       ActionTimer.current())
+        for futures in (self._futures, token.futures):
+            futures.add(future)
+            future.add_done_callback(futures.discard)
+        self._schedule_poll()
+
+    def _is_stale(self, generation):
+        """Whether a load was cancelled since it was started"""
+        loader_generation, token, token_generation = generation
+        return loader_generation != self._generation or token_generation != token.generation
+
+    def _decode(self, generation, path, size, fit, callback, span):
+        """Worker: decode and resize one image unless its load was cancelled"""
+        if self._is_stale(generation):
+            return
+        try:
+            with self.action_timer.phase('image', span):
+                image = self.cache.load_image(path, size, fit)
+        except Exception:
+            image = None
+        self._results.put((generation, path, size, fit, image, callback, span))
+
+    def _schedule_poll(self):
+        """Make sure a poll for finished images is pending"""
+        if not self._polling:
+            self._polling = True
+            self.root.after(self.POLL_INTERVAL_MS, self._poll)
+
+    def _poll(self):
+        """Tk thread: hand every finished image to its callback"""
+        self._polling = False
+        while True:
+            try:
+                generation, path, size, fit, image, callback, span = self._results.get_nowait()
+            except queue.Empty:
+                break
+            if self._is_stale(generation):
+                continue
+
+            photo = None
+            if image is not None:
+                try:
+                    with self.action_timer.phase('image', span):
+                        photo = self.cache.put_photo(path, size, image, fit)
+                except Exception:
+                    photo = None
+            callback(photo)
+
+        if self._futures or not self._results.empty():
+            self._schedule_poll()
+
+    def cancel(self, token):
+        """Cancel the pending loads started with token and drop results of its loads already running"""
+        token.generation += 1
+        for future in list(token.futures):
+            future.cancel()
+
+    def cancel_all(self):
+        """Cancel every caller's pending loads and drop results of loads already running"""
+        self._generation += 1
+        for future in list(self._futures):
+            future.cancel()
+
+    def shutdown(self):
+        """Cancel everything and stop the worker threads"""
+        self.cancel_all()
+        self._executor.shutdown(wait=False)
@@ -0,0 +1,10 @@
+class LatencyStats:
+    """Helpers shared by the benchmark and the GUI action timer"""
+
+    @staticmethod
+    def percentile(sorted_values, fraction):
+        """Nearest-rank percentile of an already sorted list"""
+        if not sorted_values:
+            return 0.0
+        rank = max(1, int(round(fraction * len(sorted_values) + 0.5)))
+        return sorted_values[min(rank, len(sorted_values)) - 1]
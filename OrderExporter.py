@@ -0,0 +1,149 @@
+import os
+import csv
+import sys
+import json
+from DatabaseManager import DatabaseManager
+
+class OrderExporter:
+    BATCH_SIZE = 1000  # Lines read from the database and written to the file at a time
+    COLUMNS = ('order_id', 'created_at', 'customer_username', 'status', 'shipping_method',
+               'order_total', 'gift_note', 'customization', 'ISBN', 'title', 'author',
+               'category', 'unit_price', 'quantity')
+
+    def __init__(self, batch_size=BATCH_SIZE):
+        """
+        Export orders with their books, one line per book of an order, to
+        CSV or JSONL. Lines are streamed from the database and written in
+        batches, so memory use does not grow with the number of orders.
+        """
+        if batch_size < 1:
+            raise ValueError("Batch size must be at least 1")
+        self.batch_size = batch_size
+        self.db_manager = DatabaseManager()
+
+    def iter_lines(self, statuses=None, min_order_id=None, max_order_id=None,
+                   since_version=None, until_version=None):
+        """
+        Yield the order lines matching the filters, in order_id order.
+        statuses: only orders with one of these statuses (any case)
+        min_order_id / max_order_id: inclusive order_id range
+        since_version / until_version: only orders whose row_version is
+        above since_version and at most until_version (the checkpoint)
+        unit_price is the price the book was sold at; orders placed before
+        it was recorded fall back to the book's current price.
+        """
+        query = """
+        SELECT o.order_id, o.created_at, o.customer_username, o.status, o.shipping_method,
+               o.total AS order_total, o.gift_note, o.customization, ob.book_isbn AS ISBN,
+               b.title, b.author, b.category, COALESCE(ob.unit_price, b.price) AS unit_price, ob.quantity
+        FROM orders o
+        JOIN order_books ob ON ob.order_id = o.order_id
+        LEFT JOIN books b ON b.ISBN = ob.book_isbn
+        WHERE 1 = 1
+        """
+        params = []
+        if statuses:
+            statuses = [status.lower() for status in statuses]
+            query += f" AND LOWER(o.status) IN ({', '.join('?' * len(statuses))})"
+            params.extend(statuses)
+        if min_order_id is not None:
+            query += " AND o.order_id >= ?"
+            params.append(min_order_id)
+        if max_order_id is not None:
+            query += " AND o.order_id <= ?"
+            params.append(max_order_id)
+        if since_version is not None:
+            query += " AND o.row_version > ?"
+            params.append(since_version)
+        if until_version is not None:
+            query += " AND o.row_version <= ?"
+            params.append(until_version)
+        query += " ORDER BY o.order_id, ob.book_isbn"
+        return self.db_manager.iter_entries(query, tuple(params), batch_size=self.batch_size)
+
+    @staticmethod
+    def read_checkpoint(checkpoint_path):
+        """Return the orders row_version exported up to according to the checkpoint file, or None"""
+        try:
+            with open(checkpoint_path, 'r') as f:
+                content = f.read().strip()
+            return int(content) if content else None
+        except FileNotFoundError:
+            return None
+
+    @staticmethod
+    def write_checkpoint(checkpoint_path, version):
+        """Record the orders row_version exported up to (replacing the file atomically)"""
+        temp_path = f"{checkpoint_path}.tmp"
+        with open(temp_path, 'w') as f:
+            f.write(f"{version}\n")
+        os.replace(temp_path, checkpoint_path)
+
+    def export(self, path, file_format=None, statuses=None, min_order_id=None,
+               max_order_id=None, checkpoint_path=None):
+        """
+        Write the matching order lines to path as 'csv' or 'jsonl' (guessed
+        from the extension if file_format is not given).
+        With checkpoint_path only orders added or changed since the previous
+        run are written (by orders.row_version), and the checkpoint moves
+        forward once the file is complete (incremental exports). An order
+        skipped by the status filter is picked up by a later run once its
+        status changes; an order that changes again is exported again.
+        Returns the number of lines and orders written, the last order_id
+        and the row_version the checkpoint now stands at.
+        """
+        if file_format is None:
+            file_format = 'csv' if path.lower().endswith('.csv') else 'jsonl'
+        if file_format not in ('csv', 'jsonl'):
+            raise ValueError(f"Unknown export format: {file_format}")
+
+        since_version = until_version = None
+        if checkpoint_path:
+            since_version = self.read_checkpoint(checkpoint_path)
+            # Changes committed while the export runs are left to the next run
+            until_version = self.db_manager.get_table_version('orders')
+        result = {'lines': 0, 'orders': 0, 'last_order_id': None, 'row_version': until_version}
+        lines = self.iter_lines(statuses, min_order_id, max_order_id, since_version, until_version)
+
+        with open(path, 'w', newline='', encoding='utf-8') as f:
+            if file_format == 'csv':
+                writer = csv.writer(f)
+                writer.writerow(self.COLUMNS)
+            batch = []
+
+            def write_batch():
+                if file_format == 'csv':
+                    writer.writerows(batch)
+                else:
+                    f.writelines(json.dumps(dict(zip(self.COLUMNS, line))) + "\n" for line in batch)
+                batch.clear()
+
+            try:
+                for line in lines:
+                    batch.append(line)
+                    result['lines'] += 1
+                    if line.order_id != result['last_order_id']:
+                        result['orders'] += 1
+                        result['last_order_id'] = line.order_id
+                    if len(batch) >= self.batch_size:
+                        write_batch()
+                if batch:
+                    write_batch()
+            finally:
+                lines.close()
+
+        if checkpoint_path:
+            self.write_checkpoint(checkpoint_path, until_version)
+        return result
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print("Usage: python OrderExporter.py <orders.csv|orders.jsonl> [status,...] [checkpoint file]")
+        sys.exit(1)
+
+    statuses = sys.argv[2].split(',') if len(sys.argv) > 2 and sys.argv[2] else None
+    checkpoint = sys.argv[3] if len(sys.argv) > 3 else None
+    summary = OrderExporter().export(sys.argv[1], statuses=statuses, checkpoint_path=checkpoint)
+    print(f"Exported {summary['lines']} lines from {summary['orders']} orders "
+          f"(last order_id: {summary['last_order_id']}, row_version: {summary['row_version']})")
@@ -0,0 +1,179 @@
+import tkinter as tk
+from tkinter import ttk
+from DatabaseManager import DatabaseManager
+
+class PagedTreeview:
+    PAGE_SIZE = 100  # Rows fetched per page
+    LOAD_THRESHOLD = 0.9  # Fetch the next page once scrolled past this fraction
+
+    def __init__(self, tree, scrollbar, table, columns, key_column, descending=False):
+        """
+        Data source that fills a Treeview page by page as the user scrolls.
+        Rows are fetched with keyset pagination on key_column; headings sort
+        the table on the database side and set_filter narrows it down by
+        column. columns are the table columns shown, in the tree's order.
+        """
+        self.tree = tree
+        self.scrollbar = scrollbar
+        self.table = table
+        self.columns = list(columns)
+        self.key_column = key_column
+        self.default_descending = descending
+
+        self.sort_column = key_column
+        self.descending = descending
+        self.filters = {}
+        self.last_row = None
+        self.first_key = None  # Key of the first row loaded
+        self.has_more = True
+        self._loading = False
+        self._key_index = self.columns.index(key_column)
+
+        self.tree.configure(yscrollcommand=self._on_scroll)
+        for heading, column in zip(self.tree['columns'], self.columns):
+            self.tree.heading(heading, command=lambda c=column: self.sort_by(c))
+
+    def refresh(self):
+        """Clear the tree and load the first page again"""
+        children = self.tree.get_children()
+        if children:
+            self.tree.delete(*children)
+        self.last_row = None
+        self.first_key = None
+        self.has_more = True
+        self.load_more()
+
+    def load_more(self):
+        """Append the next page of rows to the tree"""
+        if not self.has_more or self._loading:
+            return
+        self._loading = True
+        try:
+            db_manager = DatabaseManager()
+            rows = db_manager.fetch_page(self.table, self.columns, self.key_column,
+                                         sort_column=self.sort_column,
+                                         descending=self.descending,
+                                         filters=self.filters,
+                                         after=self.last_row,
+                                         limit=self.PAGE_SIZE)
+            for row in rows:
+                iid = str(row[self._key_index])
+                # A row added by apply_changes since may come round again
+                if self.tree.exists(iid):
+                    self.tree.item(iid, values=row)
+                else:
+                    self.tree.insert('', tk.END, iid=iid, values=row)
+            if rows:
+                if self.last_row is None:
+                    self.first_key = rows[0][self._key_index]
+                self.last_row = rows[-1]
+            self.has_more = len(rows) == self.PAGE_SIZE
+        finally:
+            self._loading = False
+
+    def sort_by(self, column):
+        """Sort by column, toggling the direction when it is already the sort column"""
+        if column == self.sort_column:
+            self.descending = not self.descending
+        else:
+            self.sort_column = column
+            self.descending = False
+        self.refresh()
+
+    def set_filter(self, column, text):
+        """Only show rows whose column contains text (an empty text clears it)"""
+        self.filters = {column: text} if text else {}
+        self.refresh()
+
+    def apply_changes(self, rows):
+        """
+        Update the tree with rows that were inserted or modified.
+        Rows already shown are updated in place. Other rows are only added
+        where they belong without re-sorting: above the first row when the
+        tree is sorted by key descending, below the last row when sorted by
+        key ascending and fully loaded. Any other row not shown (e.g. a
+        change to an order on a page not loaded yet) is left for paging or
+        the next refresh, as are new rows of filtered trees.
+        """
+        new_rows = []
+        for row in rows:
+            iid = str(row[self._key_index])
+            if self.tree.exists(iid):
+                self.tree.item(iid, values=row)
+            else:
+                new_rows.append(row)
+
+        if not new_rows or self.filters or self.sort_column != self.key_column:
+            return
+        key = self._key_index
+        new_rows.sort(key=lambda row: row[key], reverse=self.descending)
+        if self.descending:
+            if self.first_key is not None:
+                new_rows = [row for row in new_rows if row[key] > self.first_key]
+            for row in reversed(new_rows):
+                self.tree.insert('', 0, iid=str(row[key]), values=row)
+            if new_rows:
+                self.first_key = new_rows[0][key]
+                if self.last_row is None:
+                    self.last_row = new_rows[-1]
+        elif not self.has_more:
+            if self.last_row is not None:
+                new_rows = [row for row in new_rows if row[key] > self.last_row[key]]
+            for row in new_rows:
+                self.tree.insert('', tk.END, iid=str(row[key]), values=row)
+            if new_rows:
+                self.last_row = new_rows[-1]
+                if self.first_key is None:
+                    self.first_key = new_rows[0][key]
+
+    def start_auto_refresh(self, interval_ms=2000):
+        """
+        Poll for changes every interval_ms and apply only the changed rows.
+        The table needs a trigger-maintained row_version column (orders).
+        Each poll is a cheap marker check unless something was written.
+        """
+        db_manager = DatabaseManager()
+        state = {
+            'marker': db_manager.get_change_marker(),
+            'version': db_manager.get_table_version(self.table)
+        }
+
+        def poll():
+            if not self.tree.winfo_exists():
+                return
+            marker = db_manager.get_change_marker()
+            if marker != state['marker']:
+                state['marker'] = marker
+                version = db_manager.get_table_version(self.table)
+                if version != state['version']:
+                    rows = db_manager.fetch_changed_rows(self.table, self.columns, state['version'])
+                    state['version'] = version
+                    self.apply_changes(rows)
+            self.tree.after(interval_ms, poll)
+
+        self.tree.after(interval_ms, poll)
+
+    def create_filter_bar(self, parent):
+        """Build a column chooser and search entry that filter this tree"""
+        filter_frame = tk.Frame(parent)
+        headings = list(self.tree['columns'])
+        column_var = tk.StringVar(value=headings[0])
+        text_var = tk.StringVar()
+
+        def apply_filter():
+            self.set_filter(self.columns[headings.index(column_var.get())], text_var.get())
+
+        tk.Label(filter_frame, text="Filter:").pack(side=tk.LEFT, padx=5)
+        ttk.Combobox(filter_frame, textvariable=column_var, values=headings,
+                     state='readonly', width=18).pack(side=tk.LEFT, padx=5)
+        text_entry = tk.Entry(filter_frame, textvariable=text_var, width=30)
+        text_entry.pack(side=tk.LEFT, padx=5)
+        text_entry.bind('<Return>', lambda e: apply_filter())
+        tk.Button(filter_frame, text="Apply", command=apply_filter).pack(side=tk.LEFT, padx=5)
+        return filter_frame
+
+    def _on_scroll(self, first, last):
+        """Keep the scrollbar in sync and fetch more rows near the bottom"""
+        self.scrollbar.set(first, last)
+        if self.has_more and float(last) >= self.LOAD_THRESHOLD:
+            self.tree.after_idle(self.load_more)
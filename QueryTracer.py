@@ -0,0 +1,264 @@
+import re
+import time
+import sqlite3
+import threading
+
+class QueryTracer:
+    SLOW_QUERY_MS = 100  # Executions slower than this go to the slow-query log
+    SLOW_LOG_PATH = 'slow_queries.log'
+    SUMMARY_PATH = 'sql_trace_summary.txt'
+    MAX_LOGGED_PARAMS = 200  # Characters of the parameters written to the slow-query log
+
+    _literals = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b")
+
+    def __init__(self, slow_query_ms=SLOW_QUERY_MS, slow_log_path=SLOW_LOG_PATH):
+        """
+        Collect per-statement SQL statistics: how often each statement ran,
+        its total and slowest latency (execute plus fetches) and the rows it
+        returned. Executions slower than slow_query_ms are appended to the
+        slow-query log with their EXPLAIN QUERY PLAN.
+        Statements are timed by TracingCursor; the sqlite3 trace callback
+        counts the ones run without a cursor (BEGIN, COMMIT, ...).
+        """
+        self.slow_query_ms = slow_query_ms
+        self.slow_log_path = slow_log_path
+        self._stats = {}  # statement -> [count, total seconds, max seconds, rows]
+        self._untimed = {}  # statement -> count, from the trace callback
+        self._lock = threading.Lock()
+        self._local = threading.local()  # Set while a TracingCursor runs a statement
+        self.slow_queries = 0
+
+    @staticmethod
+    def normalize(sql):
+        """Collapse whitespace so the same statement is always counted under one key"""
+        return " ".join(sql.split())
+
+    def record(self, sql, seconds, rows=0, executed=False):
+        """Add time (and fetched rows) to a statement; executed counts one more run"""
+        with self._lock:
+            stats = self._stats.get(sql)
+            if stats is None:
+                stats = self._stats[sql] = [0, 0.0, 0.0, 0]
+            if executed:
+                stats[0] += 1
+            stats[1] += seconds
+            stats[3] += rows
+            return stats
+
+    def finish(self, sql, raw_sql, seconds, params, connection):
+        """Close one execution that took seconds in all, logging it if it was slow"""
+        with self._lock:
+            stats = self._stats.get(sql)
+            if stats is not None and seconds > stats[2]:
+                stats[2] = seconds
+        if seconds * 1000 >= self.slow_query_ms:
+            self.log_slow_query(raw_sql, params, seconds, connection)
+
+    def trace_callback(self, statement):
+        """sqlite3 trace callback: count statements that did not go through a TracingCursor"""
+        if getattr(self._local, 'active', False):
+            return
+        # The callback sees the statement with its values filled in
+        statement = self._literals.sub('?', self.normalize(statement))
+        with self._lock:
+            self._untimed[statement] = self._untimed.get(statement, 0) + 1
+
+    def explain(self, sql, params, connection):
+        """Return the EXPLAIN QUERY PLAN lines of a statement, or why there are none"""
+        self._local.active = True
+        try:
+            cursor = sqlite3.Connection.cursor(connection)  # Untraced
+            try:
+                cursor.execute(f"EXPLAIN QUERY PLAN {sql}", params or ())
+                return [row[3] for row in cursor.fetchall()]
+            finally:
+                cursor.close()
+        except sqlite3.Error as e:
+            return [f"(no plan: {e})"]
+        finally:
+            self._local.active = False
+
+    def log_slow_query(self, sql, params, seconds, connection):
+        """Append a slow execution and its query plan to the slow-query log"""
+        plan = self.explain(sql, params, connection)
+        params_text = repr(params)
+        if len(params_text) > self.MAX_LOGGED_PARAMS:
+            params_text = params_text[:self.MAX_LOGGED_PARAMS] + "..."
+        entry = [f"{time.strftime('%Y-%m-%d %H:%M:%S')}  {seconds * 1000:.1f} ms",
+                 f"  SQL: {self.normalize(sql)}",
+                 f"  params: {params_text}"]
+        entry.extend(f"  plan: {line}" for line in plan)
+        with self._lock:
+            self.slow_queries += 1
+            try:
+                with open(self.slow_log_path, 'a') as f:
+                    f.write("\n".join(entry) + "\n\n")
+            except OSError as e:
+                print(f"Error writing the slow-query log: {e}")
+
+    def summary(self, order_by='total_ms', limit=None):
+        """
+        Return one dictionary per statement with its count, total, mean and
+        max latency in milliseconds and rows returned, slowest first.
+        """
+        with self._lock:
+            rows = [{
+                'statement': sql,
+                'count': count,
+                'total_ms': total * 1000,
+                'mean_ms': total * 1000 / count if count else 0.0,
+                'max_ms': longest * 1000,
+                'rows': fetched,
+            } for sql, (count, total, longest, fetched) in self._stats.items()]
+        rows.sort(key=lambda row: row[order_by], reverse=True)
+        return rows[:limit] if limit else rows
+
+    def untimed_summary(self):
+        """Return (statement, count) for the statements seen only by the trace callback"""
+        with self._lock:
+            return sorted(self._untimed.items(), key=lambda item: item[1], reverse=True)
+
+    def format_summary(self, limit=50):
+        """Render the summary as a plain-text table"""
+        lines = [f"{'count':>7} {'total ms':>10} {'mean ms':>9} {'max ms':>9} {'rows':>8}  statement"]
+        for row in self.summary(limit=limit):
+            statement = row['statement']
+            if len(statement) > 120:
+                statement = statement[:117] + "..."
+            lines.append(f"{row['count']:>7} {row['total_ms']:>10.1f} {row['mean_ms']:>9.2f} "
+                         f"{row['max_ms']:>9.2f} {row['rows']:>8}  {statement}")
+        untimed = self.untimed_summary()
+        if untimed:
+            lines.append("")
+            lines.append("Statements run without a cursor (counted only):")
+            lines.extend(f"{count:>7}  {statement}" for statement, count in untimed[:limit])
+        lines.append("")
+        lines.append(f"Slow executions (>= {self.slow_query_ms} ms): {self.slow_queries}, "
+                     f"logged to {self.slow_log_path}")
+        return "\n".join(lines)
+
+    def dump(self, path=SUMMARY_PATH):
+        """Write the summary to path (or print it if path is None)"""
+        text = self.format_summary()
+        if path is None:
+            print(text)
+            return
+        try:
+            with open(path, 'w') as f:
+                f.write(text + "\n")
+        except OSError as e:
+            print(f"Error writing the SQL trace summary: {e}")
+
+    def reset(self):
+        """Forget everything recorded so far"""
+        with self._lock:
+            self._stats.clear()
+            self._untimed.clear()
+            self.slow_queries = 0
+
+
+class TracingCursor(sqlite3.Cursor):
+    """
+    Cursor that times its statements for the QueryTracer of its connection.
+    An execution lasts from execute() until its rows are exhausted, the
+    cursor runs another statement or it is closed; fetch time and the rows
+    fetched are charged to the statement being read.
+    """
+
+    def __init__(self, connection):
+        super().__init__(connection)
+        self._tracer = connection.tracer
+        self._statement = None  # (key, sql, params) being read
+        self._elapsed = 0.0
+
+    def _run(self, method, sql, params):
+        self._finish()
+        tracer = self._tracer
+        key = tracer.normalize(sql)
+        tracer._local.active = True
+        started = time.perf_counter()
+        try:
+            return method(sql, params)
+        finally:
+            seconds = time.perf_counter() - started
+            tracer._local.active = False
+            tracer.record(key, seconds, executed=True)
+            self._statement = (key, sql, params)
+            self._elapsed = seconds
+            # Statements returning no rows are complete once executed
+            if self.description is None:
+                self._finish()
+
+    def _finish(self):
+        if self._statement is not None:
+            key, sql, params = self._statement
+            self._statement = None
+            self._tracer.finish(key, sql, self._elapsed, params, self.connection)
+
+    def _fetched(self, seconds, rows, exhausted):
+        if self._statement is None:
+            return
+        self._elapsed += seconds
+        self._tracer.record(self._statement[0], seconds, rows)
+        if exhausted:
+            self._finish()
+
+    def execute(self, sql, parameters=()):
+        return self._run(super().execute, sql, parameters)
+
+    def executemany(self, sql, seq_of_parameters):
+        # Only the first parameter set is kept for the query plan
+        seq_of_parameters = list(seq_of_parameters)
+        self._run(lambda sql, params: super(TracingCursor, self).executemany(sql, seq_of_parameters),
+                  sql, seq_of_parameters[0] if seq_of_parameters else ())
+        return self
+
+    def fetchone(self):
+        started = time.perf_counter()
+        row = super().fetchone()
+        self._fetched(time.perf_counter() - started, row is not None, row is None)
+        return row
+
+    def fetchmany(self, size=None):
+        started = time.perf_counter()
+        rows = super().fetchmany(self.arraysize if size is None else size)
+        self._fetched(time.perf_counter() - started, len(rows), not rows)
+        return rows
+
+    def fetchall(self):
+        started = time.perf_counter()
+        rows = super().fetchall()
+        self._fetched(time.perf_counter() - started, len(rows), True)
+        return rows
+
+    def __next__(self):
+        row = self.fetchone()
+        if row is None:
+            raise StopIteration
+        return row
+
+    def close(self):
+        self._finish()
+        super().close()
+
+    def __del__(self):
+        # Cursors read with a single fetchone are usually just dropped
+        try:
+            self._finish()
+        except Exception:
+            pass
+
+
+class TracedConnection(sqlite3.Connection):
+    """Connection handing out TracingCursors while a QueryTracer is attached"""
+    tracer = None
+
+    def cursor(self, factory=None):
+        if factory is None:
+            factory = TracingCursor if self.tracer is not None else sqlite3.Cursor
+        return super().cursor(factory)
+
+    def attach_tracer(self, tracer):
+        """Start (or, with None, stop) tracing this connection's statements"""
+        self.tracer = tracer
+        self.set_trace_callback(tracer.trace_callback if tracer is not None else None)
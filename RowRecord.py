@@ -0,0 +1,35 @@
+import threading
+from collections import namedtuple
+
+class RowRecord:
+    _types = {}  # Column names -> record type
+    _lock = threading.Lock()
+    _last = (None, None)  # (cursor.description, record type) of the last row built
+
+    @classmethod
+    def record_type(cls, columns):
+        """
+        Return the record type for a tuple of column names.
+        Records are namedtuples: immutable, as small as a plain tuple, and
+        readable both by position (row[1]) and by name (row.title).
+        Names that are not valid identifiers are renamed to _0, _1, ...
+        """
+        record_type = cls._types.get(columns)
+        if record_type is None:
+            with cls._lock:
+                record_type = cls._types.get(columns)
+                if record_type is None:
+                    record_type = namedtuple('Row', columns, rename=True)
+                    cls._types[columns] = record_type
+        return record_type
+
+    @classmethod
+    def row_factory(cls, cursor, row):
+        """sqlite3 row factory turning each fetched row into a record"""
+        description, record_type = cls._last
+        # A query's rows share one description, so it is only looked up once
+        if cursor.description is not description:
+            description = cursor.description
+            record_type = cls.record_type(tuple(column[0] for column in description))
+            cls._last = (description, record_type)
+        return record_type._make(row)
@@ -5,5 +5,5 @@ class StandardOrder(Order):
         return "Standard Order"
 
     def calculate_total(self):
-        self.total = sum(book['price'] for book in self.book_list)
+        self.total = sum(book['price'] * book.get('quantity', 1) for book in self.book_list)
         return self.total
@@ -0,0 +1,181 @@
+import os
+import hashlib
+import threading
+from collections import OrderedDict
+from PIL import Image, ImageTk
+
+class ThumbnailCache:
+    _instance = None  # To hold the single instance of the class
+    _lock = threading.Lock()
+
+    CACHE_DIR = 'thumbnail_cache'  # On-disk cache of pre-resized thumbnails
+    MAX_MEMORY_BYTES = 32 * 1024 * 1024  # Budget for decoded PhotoImages
+    MAX_DISK_BYTES = 64 * 1024 * 1024  # Budget for the disk cache; the oldest thumbnails go first
+    DISK_TRIM_RATIO = 0.9  # Trimming frees space down to this share of the budget
+
+    def __new__(cls):
+        """Singleton pattern so every window shares the same cache"""
+        with cls._lock:
+            if cls._instance is None:
+                cls._instance = super(ThumbnailCache, cls).__new__(cls)
+                cls._instance._initialize_cache()
+        return cls._instance
+
+    def _initialize_cache(self):
+        """Set up the in-memory LRU and make sure the disk cache exists"""
+        self._photos = OrderedDict()  # key -> (PhotoImage, size in bytes)
+        self._memory_used = 0
+        self._photos_lock = threading.Lock()
+        self._disk_lock = threading.Lock()
+        try:
+            os.makedirs(self.CACHE_DIR, exist_ok=True)
+        except OSError as e:
+            print(f"Error creating thumbnail cache directory: {e}")
+        self._disk_used = sum(size for _, _, size in self._disk_entries())
+
+    @staticmethod
+    def make_key(path, size, fit=False):
+        """
+        Build the cache key for an image at a given size.
+        The file's modification time is part of the key, so replacing a
+        cover image invalidates its cached thumbnails.
+        """
+        return (os.path.abspath(path), os.path.getmtime(path), tuple(size), fit)
+
+    def _disk_path(self, key):
+        """Return the file the thumbnail for key is stored in"""
+        digest = hashlib.sha1(repr(key).encode('utf-8')).hexdigest()
+        return os.path.join(self.CACHE_DIR, f"{digest}.png")
+
+    def _disk_entries(self):
+        """Return (modification time, path, size) for every thumbnail on disk"""
+        entries = []
+        try:
+            with os.scandir(self.CACHE_DIR) as scan:
+                for entry in scan:
+                    if entry.name.endswith('.png'):
+                        try:
+                            stat = entry.stat()
+                        except OSError:
+                            continue
+                        entries.append((stat.st_mtime, entry.path, stat.st_size))
+        except OSError as e:
+            print(f"Error reading thumbnail cache directory: {e}")
+        return entries
+
+    def _add_to_disk(self, disk_path):
+        """Count a newly written thumbnail and delete the oldest ones once over budget"""
+        try:
+            size = os.path.getsize(disk_path)
+        except OSError:
+            return
+        with self._disk_lock:
+            self._disk_used += size
+            if self._disk_used <= self.MAX_DISK_BYTES:
+                return
+            entries = sorted(self._disk_entries())
+            self._disk_used = sum(size for _, _, size in entries)
+            target = self.MAX_DISK_BYTES * self.DISK_TRIM_RATIO
+            for _, path, size in entries:
+                if self._disk_used <= target or path == disk_path:
+                    break
+                try:
+                    os.remove(path)
+                    self._disk_used -= size
+                except OSError as e:
+                    print(f"Error removing cached thumbnail: {e}")
+
+    @staticmethod
+    def _fit_size(image, size):
+        """Largest size with the image's aspect ratio that fits inside size"""
+        box_width, box_height = size
+        aspect_ratio = image.width / image.height
+        if aspect_ratio > box_width / box_height:
+            return box_width, max(1, int(box_width / aspect_ratio))
+        return max(1, int(box_height * aspect_ratio)), box_height
+
+    def load_image(self, path, size, fit=False):
+        """
+        Return a PIL image of path resized to size.
+        With fit=True the image keeps its aspect ratio and fits inside size.
+        Thumbnails are read from the disk cache when possible and written to
+        it after decoding. Safe to call from any thread.
+        """
+        key = self.make_key(path, size, fit)
+        disk_path = self._disk_path(key)
+
+        if os.path.exists(disk_path):
+            try:
+                with Image.open(disk_path) as cached:
+                    cached.load()
+                    image = cached.copy()
+                # Mark it recently used so trimming removes it last
+                try:
+                    os.utime(disk_path)
+                except OSError:
+                    pass
+                return image
+            except Exception as e:
+                print(f"Error reading cached thumbnail: {e}")
+
+        with Image.open(path) as original:
+            target_size = self._fit_size(original, size) if fit else tuple(size)
+            image = original.resize(target_size, Image.Resampling.LANCZOS)
+
+        try:
+            temp_path = f"{disk_path}.{threading.get_ident()}.tmp"
+            image.save(temp_path, format='PNG')
+            os.replace(temp_path, disk_path)
+            self._add_to_disk(disk_path)
+        except Exception as e:
+            print(f"Error saving cached thumbnail: {e}")
+        return image
+
+    def get_cached_photo(self, path, size, fit=False):
+        """Return the PhotoImage for path at size if it is in memory, else None"""
+        try:
+            key = self.make_key(path, size, fit)
+        except OSError:
+            return None
+        with self._photos_lock:
+            entry = self._photos.get(key)
+            if entry is None:
+                return None
+            self._photos.move_to_end(key)
+            return entry[0]
+
+    def put_photo(self, path, size, image, fit=False):
+        """
+        Turn a PIL image into a PhotoImage and keep it in the memory cache.
+        Must be called from the Tk thread.
+        """
+        photo = ImageTk.PhotoImage(image)
+        key = self.make_key(path, size, fit)
+        photo_bytes = image.width * image.height * 4
+        with self._photos_lock:
+            if key in self._photos:
+                self._memory_used -= self._photos.pop(key)[1]
+            self._photos[key] = (photo, photo_bytes)
+            self._memory_used += photo_bytes
+
+            # Evict the least recently used images once over budget
+            while self._memory_used > self.MAX_MEMORY_BYTES and len(self._photos) > 1:
+                _, (_, evicted_bytes) = self._photos.popitem(last=False)
+                self._memory_used -= evicted_bytes
+        return photo
+
+    def get_photo(self, path, size, fit=False):
+        """
+        Return a PhotoImage of path resized to size, decoding it only when it
+        is neither in memory nor on disk. Must be called from the Tk thread.
+        """
+        photo = self.get_cached_photo(path, size, fit)
+        if photo is None:
+            photo = self.put_photo(path, size, self.load_image(path, size, fit), fit)
+        return photo
+
+    def clear(self):
+        """Drop every PhotoImage held in memory"""
+        with self._photos_lock:
+            self._photos.clear()
+            self._memory_used = 0
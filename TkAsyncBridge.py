@@ -0,0 +1,67 @@
+import asyncio
+
+class TkAsyncBridge:
+    TICK_INTERVAL_MS = 15  # How often the asyncio loop runs while tasks are pending
+
+    def __init__(self, root):
+        """
+        Drive an asyncio event loop from Tk's mainloop.
+        While tasks are pending the loop is run for one iteration on every
+        root.after tick, so coroutines resume on the Tk thread and may
+        update widgets directly after an await.
+        """
+        self.root = root
+        self.loop = asyncio.new_event_loop()
+        self._tasks = set()
+        self._ticking = False
+
+    def spawn(self, coroutine, on_error=None):
+        """
+        Start coroutine as a task and return it.
+        If it raises, on_error(exception) is called, or the error is printed.
+        Cancelling the task (e.g. when a newer search replaces it) is silent.
+        """
+        task = self.loop.create_task(coroutine)
+        self._tasks.add(task)
+
+        def finished(task):
+            self._tasks.discard(task)
+            if task.cancelled():
+                return
+            error = task.exception()
+            if error is not None:
+                if on_error is not None:
+                    on_error(error)
+                else:
+                    print(f"Error in background task: {error}")
+
+        task.add_done_callback(finished)
+        self._schedule_tick()
+        return task
+
+    def _schedule_tick(self):
+        """Make sure a tick is pending"""
+        if not self._ticking:
+            self._ticking = True
+            self.root.after(self.TICK_INTERVAL_MS, self._tick)
+
+    def _tick(self):
+        """Run every callback that is ready, then come back while tasks remain"""
+        self._ticking = False
+        if self.loop.is_closed():
+            return
+        self.loop.call_soon(self.loop.stop)
+        self.loop.run_forever()
+        if self._tasks:
+            self._schedule_tick()
+
+    def shutdown(self):
+        """Cancel the pending tasks and close the loop"""
+        if self.loop.is_closed():
+            return
+        for task in list(self._tasks):
+            task.cancel()
+        if self._tasks:
+            self.loop.call_soon(self.loop.stop)
+            self.loop.run_forever()
+        self.loop.close()
@@ -0,0 +1,194 @@
+import tkinter as tk
+from tkinter import ttk
+from ActionTimer import ActionTimer
+
+class VirtualBookGrid(tk.Frame):
+    COLUMNS = 4
+    CELL_WIDTH = 220
+    CELL_HEIGHT = 320
+    COVER_SIZE = (150, 200)
+    OVERSCAN_ROWS = 1  # Extra rows realized above and below the viewport
+    PAGE_SIZE = 40  # Books fetched per page as the user scrolls
+
+    def __init__(self, parent, image_loader, on_details, on_add_to_cart):
+        """
+        Scrollable grid of book cards that only creates widgets for the rows
+        in view. Cards scrolled out of view are reused for the rows scrolling
+        in, and books are fetched a page at a time as the user nears the end.
+        on_details(book) and on_add_to_cart(isbn) are called by the buttons.
+        """
+        super().__init__(parent)
+        self.image_loader = image_loader
+        # The loader is shared by every window; only this grid's covers are cancelled
+        self.load_token = image_loader.new_token()
+        self.on_details = on_details
+        self.on_add_to_cart = on_add_to_cart
+
+        self.canvas = tk.Canvas(self, highlightthickness=0)
+        self.scrollbar = ttk.Scrollbar(self, orient=tk.VERTICAL, command=self._on_scrollbar)
+        self.canvas.configure(yscrollcommand=self.scrollbar.set)
+        self.canvas.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        self.scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+
+        self.canvas.bind("<Configure>", lambda e: self.refresh())
+        self.bind("<Enter>", self._bind_mousewheel)
+        self.bind("<Leave>", self._unbind_mousewheel)
+        self.bind("<Destroy>", self._on_destroy)
+
+        self.fetch_page = None  # fetch_page(last_row, limit) -> list of rows
+        self.books = []  # Rows fetched so far
+        self.has_more = False
+        self.cards = {}  # Book index -> card currently showing it
+        self.free_cards = []  # Realized cards not showing any book
+
+    def set_source(self, fetch_page, first_page=None):
+        """
+        Show the books returned by fetch_page, starting from the top.
+        first_page can hold the first page when it was already fetched
+        (e.g. in the background), so it is not fetched again.
+        """
+        self.image_loader.cancel(self.load_token)
+        self.fetch_page = fetch_page
+        self.books = []
+        self.has_more = True
+        for index in list(self.cards):
+            self._release_card(index)
+        self.canvas.yview_moveto(0)
+        if first_page is None:
+            self._fetch_more()
+        else:
+            self.books = list(first_page)
+            self.has_more = len(first_page) == self.PAGE_SIZE
+        self.refresh()
+
+    def _fetch_more(self):
+        """Fetch the next page of books after the last one loaded"""
+        if not self.has_more or self.fetch_page is None:
+            return
+        last_row = self.books[-1] if self.books else None
+        with ActionTimer().phase('sql'):
+            page = self.fetch_page(last_row, self.PAGE_SIZE)
+        self.books.extend(page)
+        self.has_more = len(page) == self.PAGE_SIZE
+
+    def _update_scrollregion(self):
+        """Size the scroll region to the rows loaded (plus one if more may follow)"""
+        rows = -(-len(self.books) // self.COLUMNS) + (1 if self.has_more else 0)
+        self.canvas.configure(scrollregion=(0, 0, self.COLUMNS * self.CELL_WIDTH,
+                                            max(rows * self.CELL_HEIGHT, 1)))
+
+    def refresh(self):
+        """Realize cards for the visible rows and recycle the rest"""
+        top = self.canvas.canvasy(0)
+        bottom = top + self.canvas.winfo_height()
+        first_row = max(int(top // self.CELL_HEIGHT) - self.OVERSCAN_ROWS, 0)
+        last_row = int(bottom // self.CELL_HEIGHT) + self.OVERSCAN_ROWS
+
+        # Fetch further pages once the viewport reaches the end of the data
+        while self.has_more and (last_row + 1) * self.COLUMNS > len(self.books):
+            self._fetch_more()
+        self._update_scrollregion()
+
+        first_index = first_row * self.COLUMNS
+        last_index = min((last_row + 1) * self.COLUMNS, len(self.books))
+        visible = range(first_index, last_index)
+
+        with ActionTimer().phase('widgets'):
+            for index in list(self.cards):
+                if index not in visible:
+                    self._release_card(index)
+            for index in visible:
+                if index not in self.cards:
+                    self._show_card(index)
+
+    def _on_scrollbar(self, *args):
+        self.canvas.yview(*args)
+        self.refresh()
+
+    def _on_mousewheel(self, event):
+        if event.num == 4:
+            delta = -1
+        elif event.num == 5:
+            delta = 1
+        else:
+            delta = int(-1 * (event.delta / 120))
+        self.canvas.yview_scroll(delta, "units")
+        self.refresh()
+
+    def _bind_mousewheel(self, event):
+        self.canvas.bind_all("<MouseWheel>", self._on_mousewheel)
+        self.canvas.bind_all("<Button-4>", self._on_mousewheel)
+        self.canvas.bind_all("<Button-5>", self._on_mousewheel)
+
+    def _unbind_mousewheel(self, event):
+        self.canvas.unbind_all("<MouseWheel>")
+        self.canvas.unbind_all("<Button-4>")
+        self.canvas.unbind_all("<Button-5>")
+
+    def _on_destroy(self, event):
+        # <Destroy> is also delivered for every child widget
+        if event.widget is self:
+            self.image_loader.cancel(self.load_token)
+
+    def _create_card(self):
+        """Build the widgets of one card; they are reused for many books"""
+        frame = tk.Frame(self.canvas, relief=tk.RAISED, borderwidth=1)
+        card = {'frame': frame, 'book': None}
+
+        card['image'] = tk.Label(frame)
+        card['image'].pack(fill=tk.X, pady=5)
+
+        card['title'] = tk.Label(frame, wraplength=150, font=('Arial', 10, 'bold'))
+        card['title'].pack(pady=5)
+
+        buttons_frame = tk.Frame(frame)
+        buttons_frame.pack(pady=5)
+        tk.Button(buttons_frame, text="Details",
+                  command=lambda: self.on_details(card['book'])).pack(side=tk.LEFT, padx=2)
+        card['cart'] = tk.Button(buttons_frame, text="Add to Cart",
+                                 command=lambda: self.on_add_to_cart(card['book'].ISBN))
+        card['cart'].pack(side=tk.LEFT, padx=2)
+
+        card['window'] = self.canvas.create_window(0, 0, window=frame, anchor='nw',
+                                                   width=self.CELL_WIDTH - 20,
+                                                   height=self.CELL_HEIGHT - 20)
+        return card
+
+    def _show_card(self, index):
+        """Bind a free (or new) card to the book at index and place it"""
+        card = self.free_cards.pop() if self.free_cards else self._create_card()
+        book = self.books[index]
+        card['book'] = book
+        self.cards[index] = card
+
+        row, col = divmod(index, self.COLUMNS)
+        self.canvas.coords(card['window'], col * self.CELL_WIDTH + 10, row * self.CELL_HEIGHT + 10)
+
+        card['title'].config(text=book.title)
+        if book.stock > 0:
+            card['cart'].config(text="Add to Cart", state=tk.NORMAL, fg='black')
+        else:
+            card['cart'].config(text="Out of Stock", state=tk.DISABLED, disabledforeground='red')
+
+        image_label = card['image']
+        image_label.config(image='', text="Loading..." if book.cover_image_path else "No Image Available")
+        image_label.image = None
+        if book.cover_image_path:
+            def show_cover(photo, card=card, book=book):
+                # The card may have been recycled for another book meanwhile
+                if card['book'] is not book or not image_label.winfo_exists():
+                    return
+                if photo is None:
+                    image_label.config(text="No Image Available")
+                else:
+                    image_label.config(image=photo, text="")
+                    image_label.image = photo
+
+            self.image_loader.load(book.cover_image_path, self.COVER_SIZE, show_cover, token=self.load_token)
+
+    def _release_card(self, index):
+        """Move the card showing the book at index out of sight and keep it for reuse"""
+        card = self.cards.pop(index)
+        card['book'] = None
+        self.canvas.coords(card['window'], -2 * self.CELL_WIDTH, -2 * self.CELL_HEIGHT)
+        self.free_cards.append(card)
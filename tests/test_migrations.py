@@ -0,0 +1,57 @@
+import os
+import sys
+import shutil
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from DatabaseManager import DatabaseManager
+
+
+class MigrationTest(unittest.TestCase):
+    def setUp(self):
+        """Point a fresh DatabaseManager at a throwaway database"""
+        self.work_dir = tempfile.mkdtemp(prefix='bookstore_test_')
+        self.db_path = DatabaseManager.DB_PATH
+        DatabaseManager.DB_PATH = os.path.join(self.work_dir, 'bookstore.db')
+        DatabaseManager._instance = None
+        self.db_manager = DatabaseManager()
+
+    def tearDown(self):
+        self.db_manager.close()
+        DatabaseManager._instance = None
+        DatabaseManager.DB_PATH = self.db_path
+        shutil.rmtree(self.work_dir, ignore_errors=True)
+
+    def schema(self):
+        """Every table, index and trigger definition, plus the schema version"""
+        rows = self.db_manager.fetch_all_entries(
+            "SELECT type, name, sql FROM sqlite_master WHERE name NOT LIKE 'sqlite_stat%' ORDER BY type, name")
+        return [tuple(row) for row in rows], self.db_manager.get_schema_version()
+
+    def test_migrating_a_migrated_database_changes_nothing(self):
+        latest_version = self.db_manager.MIGRATIONS[-1][0]
+        before = self.schema()
+        self.assertEqual(before[1], latest_version)
+
+        self.db_manager.migrate()
+        self.assertEqual(self.schema(), before)
+
+        # A manager opening the database again (another process) migrates nothing either
+        self.db_manager.close()
+        DatabaseManager._instance = None
+        self.db_manager = DatabaseManager()
+        self.assertEqual(self.schema(), before)
+
+    def test_rerunning_applied_migrations_succeeds(self):
+        # What a process that read a stale version used to do
+        before = self.schema()
+        self.db_manager.execute_query("PRAGMA user_version = 3")
+
+        self.db_manager.migrate()
+        self.assertEqual(self.schema(), before)
+
+
+if __name__ == '__main__':
+    unittest.main()
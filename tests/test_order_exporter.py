@@ -0,0 +1,65 @@
+import os
+import sys
+import json
+import shutil
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from DatabaseManager import DatabaseManager
+from OrderExporter import OrderExporter
+
+
+class OrderExporterTest(unittest.TestCase):
+    ORDERS = 6
+
+    def setUp(self):
+        """Point a fresh DatabaseManager at a throwaway database with ORDERS pending orders"""
+        self.work_dir = tempfile.mkdtemp(prefix='bookstore_test_')
+        self.db_path = DatabaseManager.DB_PATH
+        DatabaseManager.DB_PATH = os.path.join(self.work_dir, 'bookstore.db')
+        DatabaseManager._instance = None
+        self.db_manager = DatabaseManager()
+        self.db_manager.execute_transaction([(
+            "INSERT INTO books (ISBN, title, author, price, sold, stock, category) "
+            "VALUES ('9780000000001', 'Title', 'Author', 12.5, 0, 100, 'Fiction')", None
+        )])
+        for _ in range(self.ORDERS):
+            self.db_manager.execute_transaction([
+                ("INSERT INTO orders (customer_username, status, total, shipping_method) "
+                 "VALUES ('customer', 'pending', 12.5, 'standard')", None),
+                ("INSERT INTO order_books (order_id, book_isbn, quantity, unit_price) "
+                 "VALUES (last_insert_rowid(), '9780000000001', 1, 12.5)", None),
+            ])
+        self.checkpoint_path = os.path.join(self.work_dir, 'export.checkpoint')
+
+    def tearDown(self):
+        self.db_manager.close()
+        DatabaseManager._instance = None
+        DatabaseManager.DB_PATH = self.db_path
+        shutil.rmtree(self.work_dir, ignore_errors=True)
+
+    def confirm(self, *order_ids):
+        self.db_manager.execute_transaction([
+            ("UPDATE orders SET status = 'confirmed' WHERE order_id = ?", (order_id,)) for order_id in order_ids
+        ])
+
+    def export(self, name):
+        path = os.path.join(self.work_dir, name)
+        OrderExporter().export(path, statuses=['confirmed'], checkpoint_path=self.checkpoint_path)
+        with open(path, encoding='utf-8') as f:
+            return [json.loads(line)['order_id'] for line in f]
+
+    def test_incremental_export_picks_up_orders_confirmed_later(self):
+        """An order confirmed after a later one was exported still reaches the next export"""
+        self.confirm(2, 5)
+        self.assertEqual(self.export('first.jsonl'), [2, 5])
+
+        self.confirm(4)
+        self.assertEqual(self.export('second.jsonl'), [4])
+        self.assertEqual(self.export('third.jsonl'), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,132 @@
+import os
+import sys
+import shutil
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from DatabaseManager import DatabaseManager
+from PagedTreeview import PagedTreeview
+
+
+class FakeTree:
+    """Just enough of ttk.Treeview for PagedTreeview, without a display"""
+
+    def __init__(self):
+        self.rows = []  # iids in display order
+        self.values = {}
+
+    def __getitem__(self, option):
+        return ('Order ID', 'Customer', 'Status', 'Total')
+
+    def configure(self, **options):
+        pass
+
+    def heading(self, column, **options):
+        pass
+
+    def get_children(self):
+        return tuple(self.rows)
+
+    def delete(self, *iids):
+        for iid in iids:
+            self.rows.remove(iid)
+            del self.values[iid]
+
+    def exists(self, iid):
+        return iid in self.values
+
+    def insert(self, parent, index, iid, values):
+        if iid in self.values:
+            raise ValueError(f"Item {iid} already exists")
+        self.rows.insert(len(self.rows) if index == 'end' else index, iid)
+        self.values[iid] = values
+
+    def item(self, iid, values):
+        self.values[iid] = values
+
+
+class FakeScrollbar:
+    def set(self, first, last):
+        pass
+
+
+class PagedTreeviewTest(unittest.TestCase):
+    COLUMNS = ('order_id', 'customer_username', 'status', 'total')
+    ORDERS = 250
+
+    def setUp(self):
+        """Point a fresh DatabaseManager at a throwaway database with ORDERS orders"""
+        self.work_dir = tempfile.mkdtemp(prefix='bookstore_test_')
+        self.db_path = DatabaseManager.DB_PATH
+        DatabaseManager.DB_PATH = os.path.join(self.work_dir, 'bookstore.db')
+        DatabaseManager._instance = None
+        self.db_manager = DatabaseManager()
+        self.db_manager.execute_transaction([(
+            "INSERT INTO orders (customer_username, status, total, shipping_method) "
+            "VALUES ('customer', 'pending', 10, 'standard')", None
+        )] * self.ORDERS)
+        self.version = self.db_manager.get_table_version('orders')
+
+    def tearDown(self):
+        self.db_manager.close()
+        DatabaseManager._instance = None
+        DatabaseManager.DB_PATH = self.db_path
+        shutil.rmtree(self.work_dir, ignore_errors=True)
+
+    def make_pager(self, descending):
+        tree = FakeTree()
+        pager = PagedTreeview(tree, FakeScrollbar(), 'orders', self.COLUMNS, 'order_id',
+                              descending=descending)
+        pager.refresh()
+        return tree, pager
+
+    def apply_new_changes(self, pager):
+        """What one auto-refresh poll does after a write"""
+        rows = self.db_manager.fetch_changed_rows('orders', self.COLUMNS, self.version)
+        self.version = self.db_manager.get_table_version('orders')
+        pager.apply_changes(rows)
+
+    def test_change_to_an_order_not_loaded_is_not_shown_out_of_order(self):
+        tree, pager = self.make_pager(descending=True)
+        self.db_manager.execute_query("UPDATE orders SET status = 'confirmed' WHERE order_id = 5")
+        self.apply_new_changes(pager)
+
+        self.assertEqual(tree.rows[:3], ['250', '249', '248'])
+        self.assertNotIn('5', tree.rows)
+
+        # Scrolling down to the changed order's page must not insert it twice
+        while pager.has_more:
+            pager.load_more()
+        self.assertEqual(tree.rows, [str(order_id) for order_id in range(self.ORDERS, 0, -1)])
+        self.assertEqual(tree.values['5'][2], 'confirmed')
+
+    def test_new_orders_go_on_top_when_newest_first(self):
+        tree, pager = self.make_pager(descending=True)
+        self.db_manager.execute_query(
+            "INSERT INTO orders (customer_username, status, total, shipping_method) "
+            "VALUES ('customer', 'pending', 10, 'standard')")
+        self.db_manager.execute_query("UPDATE orders SET status = 'confirmed' WHERE order_id = 100")
+        self.apply_new_changes(pager)
+
+        self.assertEqual(tree.rows[:2], ['251', '250'])
+        self.assertNotIn('100', tree.rows)
+
+    def test_new_orders_go_at_the_bottom_when_oldest_first_and_fully_loaded(self):
+        tree, pager = self.make_pager(descending=False)
+        self.db_manager.execute_query("UPDATE orders SET status = 'confirmed' WHERE order_id = 200")
+        self.apply_new_changes(pager)
+        self.assertNotIn('200', tree.rows)  # Not loaded yet, and not new
+
+        while pager.has_more:
+            pager.load_more()
+        self.db_manager.execute_query(
+            "INSERT INTO orders (customer_username, status, total, shipping_method) "
+            "VALUES ('customer', 'pending', 10, 'standard')")
+        self.apply_new_changes(pager)
+        self.assertEqual(tree.rows, [str(order_id) for order_id in range(1, self.ORDERS + 2)])
+
+
+if __name__ == '__main__':
+    unittest.main()